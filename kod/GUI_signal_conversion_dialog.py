@@ -1,9 +1,10 @@
 import numpy as np
 
 from logic_signal_file_handler import SignalFileHandler
+from logic_signal_compression import RICE, rice_compatible
 from strings import *
 from PyQt5.QtWidgets import QButtonGroup, QDialog, QFileDialog, QHBoxLayout, QLabel, QLineEdit, QMessageBox, \
-    QPushButton, QRadioButton, QTextEdit, QVBoxLayout, QFormLayout, QComboBox, QGroupBox
+    QPushButton, QRadioButton, QTextEdit, QVBoxLayout, QFormLayout, QComboBox, QGroupBox, QGridLayout
 
 
 class SignalConversionDialog(QDialog):
@@ -35,18 +36,24 @@ class SignalConversionDialog(QDialog):
         params_layout.addRow(SAMPLE_FREQ, self.sampling_rate_input)
         params_layout.addRow(QUANTIZATION_LVL, self.quantization_level_input)
 
+        self.edge_mode_input = QComboBox()
+        self.edge_mode_input.addItem(EDGE_PERIODIC, 'periodic')
+        self.edge_mode_input.addItem(EDGE_PADDED, 'padded')
+        params_layout.addRow(EDGE_MODE, self.edge_mode_input)
+
 
         params_group = QGroupBox(SIGNAL_PARAMETERS)
         params_group.setLayout(params_layout)
         layout.addWidget(params_group)
 
-        operation_layout = QHBoxLayout()
+        operation_layout = QGridLayout()
         self.operation_group = QButtonGroup()
-        operations = [SAMPLING, QUANTIZATION, EXTRAPOLATION, INTERPOLATION, RECONSTRUCTION]
-        for op in operations:
+        operations = [SAMPLING, QUANTIZATION, EXTRAPOLATION, INTERPOLATION, RECONSTRUCTION, FFT_RESAMPLING,
+                      DECIMATION, CUBIC_INTERPOLATION, LAGRANGE_INTERPOLATION, FARROW_INTERPOLATION]
+        for index, op in enumerate(operations):
             radio_btn = QRadioButton(op)
             self.operation_group.addButton(radio_btn)
-            operation_layout.addWidget(radio_btn)
+            operation_layout.addWidget(radio_btn, index // 4, index % 4)
         layout.addLayout(operation_layout)
 
 
@@ -61,12 +68,12 @@ class SignalConversionDialog(QDialog):
         self.signal1_data = None
 
     def load_signal(self, path_input):
-        filename, _ = QFileDialog.getOpenFileName(self, LOAD_SIGNAL, "", "Binary Files (*.bin)")
+        filename, _ = QFileDialog.getOpenFileName(self, LOAD_SIGNAL, "", SIGNAL_FILE_FILTER)
         if filename:
             path_input.setText(filename)
 
             try:
-                metadata, signal_data = SignalFileHandler.load_signal(filename)
+                metadata, signal_data = SignalFileHandler.load_signal(filename, mmap=True)
                 params_text = f"{METADATA_LABEL}\n"
                 for key, value in metadata.items():
                     params_text += f"{key}: {value}\n"
@@ -128,12 +135,18 @@ class SignalConversionDialog(QDialog):
             # Pass the inputs to the conversion function
             result_signal, result_metadata = SignalFileHandler.perform_signal_conversion(
                 self.signal1_data, metadata_dict, operation,
-                frequency=frequency, quantization_lvl=quantization_lvl
+                frequency=frequency, quantization_lvl=quantization_lvl,
+                edge_mode=self.edge_mode_input.currentData()
             )
 
             save_filename, _ = QFileDialog.getSaveFileName(self, SAVE_RESULT, "", "Binary Files (*.bin)")
             if save_filename:
-                SignalFileHandler.save_signal(save_filename, result_signal, metadata=result_metadata)
+                # Quantized signals are stored losslessly as Rice-coded level codes,
+                # unless they are not on a usable grid (e.g. a constant signal)
+                lossless = operation == QUANTIZATION and rice_compatible(result_signal, result_metadata)
+                compression = RICE if lossless else None
+                SignalFileHandler.save_signal(save_filename, result_signal, metadata=result_metadata,
+                                              compression=compression)
                 self.parent().generate_signal_from_file(save_filename)
                 self.close()
 
@@ -3,7 +3,7 @@ import numpy as np
 from logic_signal_file_handler import SignalFileHandler
 from strings import *
 from PyQt5.QtWidgets import QButtonGroup, QDialog, QFileDialog, QHBoxLayout, QLabel, QLineEdit, QMessageBox, \
-    QPushButton, QRadioButton, QTextEdit, QVBoxLayout, QFormLayout, QGroupBox, QCheckBox
+    QPushButton, QRadioButton, QTextEdit, QVBoxLayout, QFormLayout, QGroupBox, QComboBox
 
 
 class SignalFilterDialog(QDialog):
@@ -30,11 +30,20 @@ class SignalFilterDialog(QDialog):
 
         params_layout = QFormLayout()
         self.filtering_frequency_input = QLineEdit()
+        self.second_filtering_frequency_input = QLineEdit()
         self.number_of_taps_input = QLineEdit()
 
         params_layout.addRow(CUT_OFF_FREQUENCY, self.filtering_frequency_input)
+        params_layout.addRow(SECOND_CUT_OFF_FREQUENCY, self.second_filtering_frequency_input)
         params_layout.addRow(NUM_OF_TAPS, self.number_of_taps_input)
 
+        self.window_input = QComboBox()
+        for label, window_type in [(RECTANGULAR_WINDOW, 'boxcar'), (HANNING_WINDOW, 'hann'),
+                                   (HAMMING_WINDOW, 'hamming'), (BLACKMAN_WINDOW, 'blackman'),
+                                   (KAISER_WINDOW, 'kaiser')]:
+            self.window_input.addItem(label, window_type)
+        params_layout.addRow(WINDOW_TYPE, self.window_input)
+
 
         params_group = QGroupBox(SIGNAL_PARAMETERS)
         params_group.setLayout(params_layout)
@@ -42,16 +51,13 @@ class SignalFilterDialog(QDialog):
 
         operation_layout = QHBoxLayout()
         self.operation_group = QButtonGroup()
-        operations = [LOW_PASS_FILTER, HIGH_PASS_FILTER]
+        operations = [LOW_PASS_FILTER, HIGH_PASS_FILTER, BAND_PASS_FILTER, BAND_STOP_FILTER]
         for op in operations:
             radio_btn = QRadioButton(op)
             self.operation_group.addButton(radio_btn)
             operation_layout.addWidget(radio_btn)
         layout.addLayout(operation_layout)
 
-        self.hanning_checkbox = QCheckBox(HANNING_WINDOW)
-        layout.addWidget(self.hanning_checkbox)
-
         perform_btn = QPushButton(PERFORM_FILTER)
         perform_btn.clicked.connect(self.perform_filtering)
         layout.addWidget(perform_btn)
@@ -62,12 +68,12 @@ class SignalFilterDialog(QDialog):
         self.signal1_data = None
 
     def load_signal(self, path_input):
-        filename, _ = QFileDialog.getOpenFileName(self, LOAD_SIGNAL, "", "Binary Files (*.bin)")
+        filename, _ = QFileDialog.getOpenFileName(self, LOAD_SIGNAL, "", SIGNAL_FILE_FILTER)
         if filename:
             path_input.setText(filename)
 
             try:
-                metadata, signal_data = SignalFileHandler.load_signal(filename)
+                metadata, signal_data = SignalFileHandler.load_signal(filename, mmap=True)
                 params_text = f"{METADATA_LABEL}\n"
                 for key, value in metadata.items():
                     params_text += f"{key}: {value}\n"
@@ -120,20 +126,20 @@ class SignalFilterDialog(QDialog):
 
             # Read frequency and quantization level from inputs
             filtering_frequency = self.filtering_frequency_input.text().strip()
+            second_filtering_frequency = self.second_filtering_frequency_input.text().strip()
             num_of_taps = self.number_of_taps_input.text().strip()
-            hanning = self.hanning_checkbox.isChecked()
-
-            print("filtering freq, num of taps, hanning")
-            print(filtering_frequency, num_of_taps, hanning)
+            window_type = self.window_input.currentData()
 
             # Convert to appropriate types or set to None if empty
             filtering_frequency = int(filtering_frequency) if filtering_frequency else None
+            second_filtering_frequency = int(second_filtering_frequency) if second_filtering_frequency else None
             num_of_taps = int(num_of_taps) if num_of_taps else None
 
             # Pass the inputs to the conversion function
             result_signal, result_metadata = SignalFileHandler.perform_signal_filtering(
                 self.signal1_data, metadata_dict, operation,
-                filtering_frequency=filtering_frequency, num_of_taps=num_of_taps, is_hanning_window=hanning
+                filtering_frequency=filtering_frequency, num_of_taps=num_of_taps, window_type=window_type,
+                second_filtering_frequency=second_filtering_frequency
 
             )
 
@@ -59,12 +59,12 @@ class SignalOperationDialog(QDialog):
         self.signal2_metadata = None
 
     def load_signal(self, path_input):
-        filename, _ = QFileDialog.getOpenFileName(self, LOAD_SIGNAL, "", "Binary Files (*.bin)")
+        filename, _ = QFileDialog.getOpenFileName(self, LOAD_SIGNAL, "", SIGNAL_FILE_FILTER)
         if filename:
             path_input.setText(filename)
 
             try:
-                metadata, signal_data = SignalFileHandler.load_signal(filename)
+                metadata, signal_data = SignalFileHandler.load_signal(filename, mmap=True)
                 params_text = f"{METADATA_LABEL}\n"
                 for key, value in metadata.items():
                     params_text += f"{key}: {value}\n"
@@ -0,0 +1,105 @@
+"""
+Save / load timings of signal files: the original per-sample struct code
+against SignalFileHandler, on random float64 signals.
+
+    python benchmark_signal_io.py              # 1M, 10M and 100M samples
+    python benchmark_signal_io.py 1000000      # selected sizes only
+    python benchmark_signal_io.py --no-baseline 100000000
+
+The per-sample baseline needs about 40 bytes of RAM per sample on load (a
+list of Python floats plus the final array), so 100M samples take about 4 GB
+and over a minute. SignalFileHandler is timed with version=1, which writes
+the same bytes as the baseline, and with the default version-2 format.
+"""
+import argparse
+import json
+import os
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+from logic_signal_file_handler import SignalFileHandler
+
+DEFAULT_SIZES = (1_000_000, 10_000_000, 100_000_000)
+
+
+def save_signal_per_sample(filename, signal_data, sampling_freq=1):
+    """save_signal as it was before the bulk writes: one struct.pack per sample."""
+    metadata = {'start_time': 0, 'sampling_freq': sampling_freq, 'is_complex': False,
+                'num_samples': len(signal_data), 'duration': len(signal_data) / sampling_freq}
+    with open(filename, 'wb') as f:
+        metadata_json = json.dumps(metadata).encode('utf-8')
+        f.write(struct.pack('I', len(metadata_json)))
+        f.write(metadata_json)
+        for value in signal_data:
+            f.write(struct.pack('d', value))
+
+
+def load_signal_per_sample(filename):
+    """load_signal as it was before the bulk reads: one f.read and struct.unpack per sample."""
+    with open(filename, 'rb') as f:
+        metadata_len = struct.unpack('I', f.read(4))[0]
+        metadata = json.loads(f.read(metadata_len).decode('utf-8'))
+        signal_data = []
+        while True:
+            value_bytes = f.read(8)
+            if not value_bytes:
+                break
+            signal_data.append(struct.unpack('d', value_bytes)[0])
+        return metadata, np.array(signal_data)
+
+
+def _random_signal(num_samples):
+    return np.random.default_rng(0).standard_normal(num_samples)
+
+
+def _timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def benchmark(num_samples, directory, baseline=True):
+    """Return {name: seconds} for saving and loading num_samples samples."""
+    signal = _random_signal(num_samples)
+    filename = os.path.join(directory, 'signal.bin')
+    timings = {}
+
+    if baseline:
+        timings['save per-sample'], _ = _timed(save_signal_per_sample, filename, signal)
+    timings['save v1'], _ = _timed(SignalFileHandler.save_signal, filename, signal, version=1)
+    timings['save v2'], _ = _timed(SignalFileHandler.save_signal, filename + '2', signal)
+    del signal  # Leave the memory to the loaders; the samples are regenerated for the checks
+
+    loaders = [('load v1', lambda: SignalFileHandler.load_signal(filename, use_cache=False)),
+               ('load v2', lambda: SignalFileHandler.load_signal(filename + '2', use_cache=False))]
+    if baseline:
+        loaders.insert(0, ('load per-sample', lambda: load_signal_per_sample(filename)))
+    for name, loader in loaders:
+        timings[name], (_, loaded) = _timed(loader)
+        if not np.array_equal(loaded, _random_signal(num_samples)):
+            raise RuntimeError(f"{name} read different samples.")
+        del loaded
+
+    os.remove(filename)
+    os.remove(filename + '2')
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('sizes', nargs='*', type=int, default=DEFAULT_SIZES, help="numbers of samples")
+    parser.add_argument('--no-baseline', action='store_true', help="skip the per-sample struct code")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for num_samples in args.sizes:
+            timings = benchmark(num_samples, directory, baseline=not args.no_baseline)
+            print(f"{num_samples:>12,} samples: " + ", ".join(f"{name} {seconds:.3f} s"
+                                                               for name, seconds in timings.items()), flush=True)
+
+
+if __name__ == '__main__':
+    main()
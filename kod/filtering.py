@@ -1,57 +1,134 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import numpy as np
 import matplotlib.pyplot as plt
 
-def design_lowpass_filter(M, K, window_type='boxcar'):
+
+# Window types accepted by the filter design functions
+WINDOW_TYPES = ('boxcar', 'hann', 'hamming', 'blackman', 'kaiser')
+
+# Shape parameter of the Kaiser window (about 86 dB of stopband attenuation)
+KAISER_BETA = 8.6
+
+# Number of designed filters kept by the design cache
+FILTER_CACHE_SIZE = 256
+
+def design_lowpass_filter(M, K, window_type='boxcar', beta=KAISER_BETA):
     """
     Design a lowpass FIR filter using the window method.
-    
+
     Parameters:
     M: Number of filter coefficients (should be odd)
     K: Parameter defining cutoff frequency (fo = fp/K)
-    window_type: 'boxcar' or 'hann'
-    
+    window_type: 'boxcar', 'hann', 'hamming', 'blackman' or 'kaiser'
+    beta: Shape parameter of the Kaiser window
+
+    Returns:
+    h: Filter impulse response coefficients (a shared, read-only array;
+       designs are cached, see design_cache_info())
+    """
+    return _design_filter('lowpass', M, K, window_type, beta if window_type == 'kaiser' else None)
+
+def design_highpass_filter(M, K, window_type='hann', beta=KAISER_BETA):
+    """
+    Design a highpass FIR filter using spectral inversion of lowpass filter.
+
     Returns:
-    h: Filter impulse response coefficients
+    h: Filter impulse response coefficients (shared and read-only)
+    """
+    return _design_filter('highpass', M, K, window_type, beta if window_type == 'kaiser' else None)
+
+def design_bandpass_filter(M, K_low, K_high, window_type='hann', beta=KAISER_BETA):
+    """
+    Design a bandpass FIR filter as the difference of two lowpass filters.
+
+    Parameters:
+    M: Number of filter coefficients (should be odd)
+    K_low, K_high: Parameters defining the band edges (fp/K_low to fp/K_high,
+                   so K_low > K_high)
+
+    Returns:
+    h: Filter impulse response coefficients (shared and read-only)
+    """
+    return _design_filter('bandpass', M, K_low, window_type, beta if window_type == 'kaiser' else None, K_high)
+
+def design_bandstop_filter(M, K_low, K_high, window_type='hann', beta=KAISER_BETA):
+    """
+    Design a bandstop FIR filter using spectral inversion of bandpass filter.
+
+    Returns:
+    h: Filter impulse response coefficients (shared and read-only)
+    """
+    return _design_filter('bandstop', M, K_low, window_type, beta if window_type == 'kaiser' else None, K_high)
+
+def design_window(M, window_type='boxcar', beta=KAISER_BETA):
+    """
+    Window of M coefficients. Hann, Hamming and Blackman follow
+    w(n) = sum a_k cos(2*pi*k*n/M); Kaiser is the symmetric np.kaiser window.
     """
+    if window_type not in WINDOW_TYPES:
+        raise ValueError(f"Unsupported window type: {window_type}")
+    n = np.arange(M)
+    if window_type == 'boxcar':
+        return np.ones(M)
+    if window_type == 'hann':
+        # w(n) = 0.5 - 0.5*cos(2πn/M)
+        return 0.5 - 0.5 * np.cos(2 * np.pi * n / M)
+    if window_type == 'hamming':
+        return 0.54 - 0.46 * np.cos(2 * np.pi * n / M)
+    if window_type == 'blackman':
+        return 0.42 - 0.5 * np.cos(2 * np.pi * n / M) + 0.08 * np.cos(4 * np.pi * n / M)
+    return np.kaiser(M, beta)
+
+def design_cache_info():
+    """Hit and miss counters of the filter design cache."""
+    return _design_filter.cache_info()
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _design_filter(kind, M, K, window_type, beta, K_high=None):
     if M % 2 == 0:
         raise ValueError("M should be odd for symmetric filter")
-    
-    h = np.zeros(M)
+
+    # h(n) = sin(2π(n-(M-1)/2)/K) / (π(n-(M-1)/2)), and 2/K for n = (M-1)/2
     center = (M - 1) // 2
-    
-    for n in range(M):
-        if n == center:
-            # For n = (M-1)/2, h(n) = 2/K
-            h[n] = 2.0 / K
-        else:
-            # Otherwise: sin(2π(n-(M-1)/2)/K) / (π(n-(M-1)/2))
-            arg = 2 * np.pi * (n - center) / K
-            h[n] = np.sin(arg) / (np.pi * (n - center))
-    
+    offsets = np.arange(M) - center
+    offsets[center] = 1  # placeholder, avoids dividing by zero
+    h = np.sin(2 * np.pi * offsets / K) / (np.pi * offsets)
+    h[center] = 2.0 / K
+
+    if kind in ('bandpass', 'bandstop'):
+        if not K > K_high:
+            raise ValueError("The lower band edge has to be below the upper one (K_low > K_high).")
+        # Lowpass up to the upper edge minus lowpass up to the lower edge
+        h_high = np.sin(2 * np.pi * offsets / K_high) / (np.pi * offsets)
+        h_high[center] = 2.0 / K_high
+        h = h_high - h
+
     # Apply window function
-    if window_type == 'hann':
-        # w(n) = 0.5 - 0.5*cos(2πn/M)
-        window = np.array([0.5 - 0.5 * np.cos(2 * np.pi * n / M) for n in range(M)])
-        h = h * window
+    if window_type != 'boxcar':
+        h *= design_window(M, window_type, beta)
+
+    if kind in ('highpass', 'bandstop'):
+        h = -h
+        h[center] += 1  # Add unit impulse at center
 
+    h.flags.writeable = False
     return h
 
-def design_highpass_filter(M, K, window_type='hann'):
-    """
-    Design a highpass FIR filter using spectral inversion of lowpass filter.
-    
-    Returns:
-    h: Filter impulse response coefficients
-    """
-    h_lp = design_lowpass_filter(M, K, window_type)
-    
-    h_hp = -h_lp
-    center = (M - 1) // 2
-    h_hp[center] += 1  # Add unit impulse at center
-    
-    return h_hp
+# Relative cost of a direct multiply-add and of an FFT butterfly (per n*log2(n)),
+# measured with np.convolve and np.fft on float64; they drive method='auto'
+DIRECT_MAC_COST = 1.0
+FFT_POINT_COST = 2.5
+
+# Number of samples transformed per batch of overlap-save blocks
+FFT_BATCH_SIZE = 1 << 18
 
-def apply_filter(signal, filter_coeffs, mode='same'):
+# Number of tap spectra kept by the overlap-save cache
+SPECTRUM_CACHE_SIZE = 64
+
+def apply_filter(signal, filter_coeffs, mode='same', method='auto'):
     """
     Apply FIR filter to signal using convolution.
     Based on equation (3) from context: y(n) = Σ h(k)x(n-k)
@@ -59,17 +136,385 @@ def apply_filter(signal, filter_coeffs, mode='same'):
     Parameters:
     signal: Input signal
     filter_coeffs: Filter impulse response coefficients
+    mode: 'same' (aligned with the input, delayed by len(filter_coeffs) // 2),
+          'full' or 'valid', as in np.convolve
+    method: 'direct' (np.convolve), 'fft' (overlap-save) or 'auto', which
+          takes the cheaper one by filter_cost()
     
     Returns:
     filtered_signal: Output signal
     """
+    signal = np.asarray(signal)
+    filter_coeffs = np.asarray(filter_coeffs)
+    N, M = len(signal), len(filter_coeffs)
+    if mode == 'same':
+        # The central portion of the full convolution, matching the input length
+        start = M // 2
+        stop = start + N
+    elif mode == 'full':
+        start, stop = 0, N + M - 1
+    elif mode == 'valid':
+        start, stop = min(N, M) - 1, max(N, M)
+    else:
+        raise ValueError(f"Unsupported convolution mode: {mode}")
+
+    if method == 'auto':
+        direct_cost, fft_cost = filter_cost(stop - start, M)
+        method = 'fft' if fft_cost < direct_cost and N >= M else 'direct'
+    if method == 'fft' and N and M:
+        return _overlap_save(signal, filter_coeffs, start, stop)
+    if method not in ('direct', 'fft'):
+        raise ValueError(f"Unsupported filtering method: {method}")
+    if not N or not M:
+        # Nothing to convolve (np.convolve rejects empty inputs)
+        return np.zeros(max(stop - start, 0), dtype=np.result_type(signal, filter_coeffs))
+
     if mode == 'same':
         # Ensure output length matches input signal length
         result = np.convolve(signal, filter_coeffs, mode='full')
-        # Extract the central portion matching input length
-        delay = len(filter_coeffs) // 2
-        start_idx = delay
-        end_idx = start_idx + len(signal)
-        return result[start_idx:end_idx]
+        return result[start:stop]
     else:
-        return np.convolve(signal, filter_coeffs, mode=mode)
\ No newline at end of file
+        return np.convolve(signal, filter_coeffs, mode=mode)
+
+def filter_cost(num_outputs, num_taps, num_filters=1):
+    """
+    Estimated cost of num_outputs samples of an FIR convolution with each of
+    num_filters filters, as (direct, fft). The direct cost counts the whole
+    full convolution, which is what np.convolve computes.
+    """
+    if num_outputs <= 0:
+        return 0, 0
+    direct = DIRECT_MAC_COST * (num_outputs + num_taps - 1) * num_taps * num_filters
+    nfft = fft_block_size(num_taps, num_outputs)
+    step = nfft - num_taps + 1
+    # One forward transform, and an inverse transform and a spectrum product per filter, per block
+    fft = -(-num_outputs // step) * (FFT_POINT_COST * (1 + num_filters) * nfft * np.log2(nfft) + num_filters * nfft)
+    return direct, fft
+
+@lru_cache(maxsize=None)
+def _best_fft_size(num_taps):
+    # The power of two with the least transform work per output sample
+    sizes = 2 ** np.arange(int(np.ceil(np.log2(2 * num_taps))), int(np.ceil(np.log2(num_taps))) + 8)
+    return int(min(sizes, key=lambda n: n * np.log2(n) / (n - num_taps + 1)))
+
+def fft_block_size(num_taps, num_outputs=None):
+    """
+    FFT size of the overlap-save blocks for num_taps taps: each block yields
+    nfft - num_taps + 1 outputs. No larger than needed for num_outputs.
+    """
+    nfft = _best_fft_size(num_taps)
+    if num_outputs is not None:
+        nfft = min(nfft, 1 << int(np.ceil(np.log2(max(num_outputs + num_taps - 1, 2)))))
+    return nfft
+
+@lru_cache(maxsize=SPECTRUM_CACHE_SIZE)
+def _tap_spectrum(tap_bytes, dtype, shape, nfft, is_complex):
+    taps = np.frombuffer(tap_bytes, dtype=dtype).reshape(shape)
+    spectrum = np.fft.fft(taps, nfft) if is_complex else np.fft.rfft(taps, nfft)
+    spectrum.flags.writeable = False
+    return spectrum
+
+def _overlap_save(signal, filter_coeffs, start, stop):
+    """
+    Samples start..stop-1 of the full convolution of signal with
+    filter_coeffs, by overlap-save: every FFT block of nfft input samples
+    yields its last nfft - M + 1 samples of circular convolution, which equal
+    the linear one. Blocks are transformed in batches of FFT_BATCH_SIZE samples.
+    filter_coeffs may also be a (num_filters, M) bank, which shares the
+    forward transforms and gives one output row per filter.
+    """
+    N, M = len(signal), filter_coeffs.shape[-1]
+    bank_shape = filter_coeffs.shape[:-1]
+    nfft = fft_block_size(M, stop - start)
+    step = nfft - M + 1
+    is_complex = np.iscomplexobj(signal) or np.iscomplexobj(filter_coeffs)
+    spectrum = _tap_spectrum(filter_coeffs.tobytes(), filter_coeffs.dtype.str, filter_coeffs.shape, nfft, is_complex)
+    spectrum = spectrum[..., np.newaxis, :]  # broadcast over the blocks
+    output = np.empty(bank_shape + (stop - start,),
+                      dtype=np.result_type(signal.dtype, filter_coeffs.dtype, np.float64))
+
+    blocks_per_batch = max(FFT_BATCH_SIZE // (nfft * int(np.prod(bank_shape))), 1)
+    for batch_start in range(start, stop, blocks_per_batch * step):
+        batch_stop = min(batch_start + blocks_per_batch * step, stop)
+        num_blocks = -(-(batch_stop - batch_start) // step)
+
+        # Output n needs inputs n - M + 1 .. n; the signal is zero outside 0..N-1
+        first = batch_start - M + 1
+        last = first + (num_blocks - 1) * step + nfft
+        chunk = np.zeros(last - first, dtype=output.dtype)
+        chunk[max(-first, 0):min(N, last) - first] = signal[max(first, 0):min(N, last)]
+        segments = np.lib.stride_tricks.sliding_window_view(chunk, nfft)[::step]
+
+        if is_complex:
+            result = np.fft.ifft(np.fft.fft(segments) * spectrum)
+        else:
+            result = np.fft.irfft(np.fft.rfft(segments) * spectrum, nfft)
+        result = result[..., M - 1:].reshape(bank_shape + (-1,))
+        output[..., batch_start - start:batch_stop - start] = result[..., :batch_stop - batch_start]
+    return output
+
+# Output samples per segment of apply_filter_parallel(), at least this many
+# times the filter length so the overlap stays a small fraction
+PARALLEL_SEGMENT_SIZE = 1 << 20
+PARALLEL_MIN_SEGMENT_TAPS = 16
+
+def apply_filter_parallel(signal, filter_coeffs, out=None, max_workers=None, segment_size=None, method='auto'):
+    """
+    apply_filter(mode='same') on a thread pool. The output is cut into
+    segments and each is filtered from its own input range, extended by the
+    len(filter_coeffs) - 1 samples it overlaps with its neighbours, so the
+    segments join without seams. NumPy releases the GIL in convolution and
+    FFTs, so the segments run in parallel.
+
+    signal may be a memory map; workers read their ranges straight from it and
+    write into out (e.g. a writable np.memmap of the output file), so nothing
+    is copied in full. Returns out.
+    """
+    signal = np.asarray(signal)
+    filter_coeffs = np.asarray(filter_coeffs)
+    N, M = len(signal), len(filter_coeffs)
+    if out is None:
+        out = np.empty(N, dtype=np.result_type(signal.dtype, filter_coeffs.dtype, np.float64))
+    if segment_size is None:
+        segment_size = max(PARALLEL_SEGMENT_SIZE, PARALLEL_MIN_SEGMENT_TAPS * M)
+    delay = M // 2
+
+    def filter_segment(start):
+        stop = min(start + segment_size, N)
+        # Output n of 'same' is full-convolution sample n + delay, which needs inputs n + delay - M + 1 .. n + delay
+        first, last = start + delay - M + 1, stop + delay
+        chunk = signal[max(first, 0):min(last, N)]
+        if first < 0 or last > N:
+            chunk = np.concatenate((np.zeros(max(-first, 0), dtype=chunk.dtype), chunk,
+                                    np.zeros(max(last - N, 0), dtype=chunk.dtype)))
+        out[start:stop] = apply_filter(chunk, filter_coeffs, mode='valid', method=method)
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        # list() re-raises any exception of a worker
+        list(executor.map(filter_segment, range(0, N, segment_size)))
+    return out
+
+def design_filter_bank(M, band_edges, sampling_freq, window_type='hann', beta=KAISER_BETA):
+    """
+    Design a bank of FIR filters splitting the spectrum at band_edges (Hz,
+    increasing). Band b passes band_edges[b] .. band_edges[b + 1]; a band
+    starting at 0 is a lowpass and one reaching sampling_freq / 2 a highpass.
+
+    Returns:
+    bank: (len(band_edges) - 1, M) array of filter coefficients, for apply_filter_bank()
+    """
+    band_edges = [float(edge) for edge in band_edges]
+    if len(band_edges) < 2 or any(low >= high for low, high in zip(band_edges, band_edges[1:])):
+        raise ValueError("Band edges have to be at least two increasing frequencies.")
+    if band_edges[0] < 0 or band_edges[-1] > sampling_freq / 2:
+        raise ValueError("Band edges must be between 0 and Nyquist frequency.")
+
+    bank = []
+    for low, high in zip(band_edges, band_edges[1:]):
+        if low == 0 and high >= sampling_freq / 2:
+            h = np.zeros(M)
+            h[(M - 1) // 2] = 1.0  # the whole spectrum
+        elif low == 0:
+            h = design_lowpass_filter(M, sampling_freq / high, window_type, beta)
+        elif high >= sampling_freq / 2:
+            h = design_highpass_filter(M, sampling_freq / low, window_type, beta)
+        else:
+            h = design_bandpass_filter(M, sampling_freq / low, sampling_freq / high, window_type, beta)
+        bank.append(h)
+    return np.stack(bank)
+
+# Number of tap-by-sample products per chunk of the direct filter bank
+BANK_CHUNK_PRODUCTS = 1 << 20
+
+def apply_filter_bank(signal, bank, method='auto'):
+    """
+    Filter the signal with every filter of bank (a (num_filters, M) array,
+    e.g. from design_filter_bank()) in a single pass over the signal, instead
+    of one pass per filter.
+
+    With method='fft' every overlap-save block is transformed once and shared
+    by all filters; with 'direct' each chunk of the signal is multiplied by
+    the whole tap matrix at once. 'auto' takes the cheaper one by
+    filter_cost().
+
+    Returns:
+    bands: (num_filters, len(signal)) array, row b aligned like
+           apply_filter(signal, bank[b], mode='same')
+    """
+    signal = np.asarray(signal)
+    bank = np.atleast_2d(np.asarray(bank))
+    num_filters, M = bank.shape
+    N = len(signal)
+    delay = M // 2
+    if method == 'auto':
+        direct_cost, fft_cost = filter_cost(N, M, num_filters)
+        method = 'fft' if fft_cost < direct_cost else 'direct'
+    if method == 'fft':
+        if N == 0:
+            return np.zeros((num_filters, 0), dtype=np.result_type(signal.dtype, bank.dtype, np.float64))
+        return _overlap_save(signal, bank, delay, delay + N)
+    if method != 'direct':
+        raise ValueError(f"Unsupported filtering method: {method}")
+
+    output = np.empty((num_filters, N), dtype=np.result_type(signal.dtype, bank.dtype, np.float64))
+    # y[n] = Σ h(k)x(n-k): the window of inputs n - M + 1 .. n against the reversed taps
+    reversed_taps = bank[:, ::-1].T
+    chunk_size = max(BANK_CHUNK_PRODUCTS // M, 1)
+    for start in range(0, N, chunk_size):
+        stop = min(start + chunk_size, N)
+        # Output n of 'same' is full-convolution sample n + delay, which needs inputs n + delay - M + 1 .. n + delay
+        first, last = start + delay - M + 1, stop + delay
+        chunk = np.zeros(last - first, dtype=output.dtype)
+        chunk[max(-first, 0):min(N, last) - first] = signal[max(first, 0):min(N, last)]
+        windows = np.lib.stride_tricks.sliding_window_view(chunk, M)
+        output[:, start:stop] = (windows @ reversed_taps).T
+    return output
+
+def apply_filter_blocks(blocks, filter_coeffs, method='auto'):
+    """
+    Block-wise variant of apply_filter(mode='same'); method is as in apply_filter().
+
+    The last len(filter_coeffs) - 1 input samples are carried between blocks,
+    so the concatenated output equals apply_filter() on the whole signal.
+    Output blocks are shifted by the filter delay relative to the input blocks.
+    """
+    filter_coeffs = np.asarray(filter_coeffs)
+    history = None
+    delay = len(filter_coeffs) // 2
+    to_skip = delay
+    remaining = 0
+
+    for block in blocks:
+        block = np.asarray(block)
+        if len(block) == 0:
+            continue
+        if history is None:
+            history = np.zeros(len(filter_coeffs) - 1, dtype=np.result_type(block, filter_coeffs))
+        remaining += len(block)
+
+        # 'valid' over history + block gives the next len(block) samples of the full convolution
+        extended = np.concatenate((history, block))
+        output = apply_filter(extended, filter_coeffs, mode='valid', method=method)
+        history = extended[len(extended) - len(history):]
+
+        skipped = min(to_skip, len(output))
+        to_skip -= skipped
+        output = output[skipped:]
+        remaining -= len(output)
+        if len(output):
+            yield output
+
+    # Flush the samples that are still in the delay line
+    if history is not None and remaining > 0:
+        extended = np.concatenate((history, np.zeros(to_skip + remaining, dtype=history.dtype)))
+        output = apply_filter(extended, filter_coeffs, mode='valid', method=method)
+        yield output[to_skip:]
+
+# Number of samples StreamingFIR accumulates at a time
+STREAMING_CHUNK_SIZE = 65536
+
+class StreamingFIR:
+    """
+    FIR filter that keeps its delay line between process() calls, so a signal
+    filtered block by block has no discontinuities at the block boundaries:
+
+        fir = StreamingFIR(design_lowpass_filter(M, K, 'hann'))
+        for block in blocks:
+            output = fir.process(block)
+        output = fir.flush()
+
+    Outputs are aligned like apply_filter(mode='same'): the first
+    len(filter_coeffs) // 2 outputs of the causal filter are dropped, and
+    flush() emits the last ones (and resets the filter). Every output sample
+    is accumulated tap by tap in a fixed order, so the result does not depend
+    on how the signal is split and is bit-identical to filter(signal). The
+    delay line and work buffers are allocated once; pass out to process() and
+    flush() to reuse the output array too.
+    """
+
+    def __init__(self, filter_coeffs, chunk_size=STREAMING_CHUNK_SIZE):
+        self.taps = np.asarray(filter_coeffs)
+        self.delay = len(self.taps) // 2
+        self.nonzero = np.flatnonzero(self.taps)
+        # A chunk at least as long as the delay line keeps its shift a plain copy
+        self.chunk_size = max(chunk_size, len(self.taps) - 1, 1)
+        self._allocate(np.result_type(self.taps, np.float64))
+
+    def _allocate(self, dtype):
+        history = len(self.taps) - 1
+        self._buffer = np.zeros(history + self.chunk_size, dtype=dtype)
+        self._product = np.empty(self.chunk_size, dtype=dtype)
+        self.reset()
+
+    def reset(self):
+        self._buffer[:len(self.taps) - 1] = 0
+        self.to_skip = self.delay
+        self.num_inputs = 0
+        self.num_outputs = 0
+
+    def process(self, block, out=None):
+        """
+        Filter the next block and return the outputs that are complete, in out
+        if given (it needs room for len(block) samples).
+        """
+        block = np.asarray(block)
+        dtype = np.result_type(self._buffer, block)
+        if dtype != self._buffer.dtype:
+            # Complex input into a real filter: carry the delay line over
+            history = self._buffer[:len(self.taps) - 1].copy()
+            state = (self.to_skip, self.num_inputs, self.num_outputs)
+            self._allocate(dtype)
+            self._buffer[:len(history)] = history
+            self.to_skip, self.num_inputs, self.num_outputs = state
+
+        num_outputs = len(block) - min(self.to_skip, len(block))
+        if out is None:
+            out = np.empty(num_outputs, dtype=dtype)
+        out = out[:num_outputs]
+
+        history = len(self.taps) - 1
+        written = 0
+        for start in range(0, len(block), self.chunk_size):
+            chunk = block[start:start + self.chunk_size]
+            count = len(chunk)
+            self._buffer[history:history + count] = chunk
+
+            # Causal output i of the chunk is sum_j taps[j] * buffer[history + i - j]
+            skip = min(self.to_skip, count)
+            self.to_skip -= skip
+            target = out[written:written + count - skip]
+            if len(self.nonzero) == 0:
+                target[:] = 0
+            for index, j in enumerate(self.nonzero):
+                window = self._buffer[history - j + skip:history - j + count]
+                if index == 0:
+                    np.multiply(window, self.taps[j], out=target)
+                else:
+                    product = self._product[:len(target)]
+                    np.multiply(window, self.taps[j], out=product)
+                    target += product
+            written += len(target)
+
+            # Shift the delay line: keep the last history samples
+            self._buffer[:history] = self._buffer[count:count + history]
+
+        self.num_inputs += len(block)
+        self.num_outputs += num_outputs
+        return out
+
+    def flush(self, out=None):
+        """Emit the outputs still waiting for look-ahead, as if zeros followed, and reset."""
+        remaining = self.num_inputs - self.num_outputs
+        zeros = np.zeros(self.to_skip + remaining, dtype=self._buffer.dtype)
+        out = self.process(zeros, out)
+        self.reset()
+        return out
+
+    def filter(self, signal):
+        """Filter a whole signal in one piece, aligned like apply_filter(mode='same')."""
+        self.reset()
+        signal = np.asarray(signal)
+        output = np.empty(len(signal), dtype=np.result_type(self._buffer, signal))
+        emitted = len(self.process(signal, output))
+        self.flush(output[emitted:])
+        return output
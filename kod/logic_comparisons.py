@@ -1,15 +1,17 @@
+from itertools import zip_longest
+
 import numpy as np
 
 def mean_squared_error(original, reconstructed):
     """(C1) Mean Squared Error (MSE)"""
-    original = np.array(original)
-    reconstructed = np.array(reconstructed)
+    original = np.asarray(original)
+    reconstructed = np.asarray(reconstructed)
     return np.mean(np.abs(original - reconstructed) ** 2)
 
 def signal_to_noise_ratio(original, reconstructed):
     """(C2) Signal-to-Noise Ratio (SNR)"""
-    original = np.array(original)
-    noise = original - np.array(reconstructed)
+    original = np.asarray(original)
+    noise = original - np.asarray(reconstructed)
     signal_power = np.mean(np.abs(original) ** 2)
     noise_power = np.mean(np.abs(noise) ** 2)
     return 10 * np.log10(signal_power / noise_power) if noise_power != 0 else float('inf')
@@ -22,7 +24,43 @@ def peak_signal_to_noise_ratio(original, reconstructed):
 
 def max_difference(original, reconstructed):
     """(C4) Maximum Difference (MD)"""
-    return np.max(np.abs(np.array(original) - np.array(reconstructed)))
+    return np.max(np.abs(np.asarray(original) - np.asarray(reconstructed)))
+
+def compare_blocks(original_blocks, reconstructed_blocks):
+    """
+    Block-wise variant of (C1)-(C4): consumes two sequences of aligned blocks
+    (e.g. two iter_blocks() with the same block size) in a single pass.
+
+    Returns (mse, snr, psnr, md).
+    """
+    num_samples = 0
+    error_energy = 0.0
+    signal_energy = 0.0
+    peak = 0.0
+    md = 0.0
+
+    for original, reconstructed in zip_longest(original_blocks, reconstructed_blocks):
+        if original is None or reconstructed is None:
+            raise ValueError("Signals must be of the same length.")
+        original = np.asarray(original)
+        reconstructed = np.asarray(reconstructed)
+        if len(original) != len(reconstructed):
+            raise ValueError("Signal blocks must be of the same length.")
+        if len(original) == 0:
+            continue
+        error = np.abs(original - reconstructed)
+        num_samples += len(original)
+        error_energy += np.sum(error ** 2)
+        signal_energy += np.sum(np.abs(original) ** 2)
+        peak = max(peak, np.max(np.abs(original)))
+        md = max(md, np.max(error))
+
+    if num_samples == 0:
+        raise ValueError("Cannot compare empty signals.")
+    mse = error_energy / num_samples
+    snr = 10 * np.log10(signal_energy / error_energy) if error_energy != 0 else float('inf')
+    psnr = 10 * np.log10((peak ** 2) / mse) if mse != 0 else float('inf')
+    return mse, snr, psnr, md
 
 # # Example usage with loaded signals
 # if __name__ == "__main__":
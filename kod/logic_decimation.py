@@ -0,0 +1,293 @@
+import numpy as np
+
+from filtering import design_lowpass_filter
+
+# Multi-stage decimation: a large integer ratio is split into an optional CIC
+# stage (running sums only, no multiplications), a chain of half-band stages
+# (decimation by 2, every other tap zero) and a final FIR stage that shapes the
+# output band. The planner estimates the cost of every such split that meets
+# the passband ripple / stopband attenuation spec and runs the cheapest one.
+
+# Largest CIC order tried by the planner
+CIC_MAX_ORDER = 6
+
+
+def kaiser_parameters(attenuation_db, transition_width):
+    """
+    Kaiser window length and beta for a low-pass with the given stopband
+    attenuation and transition width (as a fraction of the sampling rate).
+    """
+    if attenuation_db > 50:
+        beta = 0.1102 * (attenuation_db - 8.7)
+    elif attenuation_db > 21:
+        beta = 0.5842 * (attenuation_db - 21) ** 0.4 + 0.07886 * (attenuation_db - 21)
+    else:
+        beta = 0.0
+    num_taps = int(np.ceil((attenuation_db - 7.95) / (14.36 * transition_width))) + 1
+    return num_taps, beta
+
+
+class _DecimatingStage:
+    """
+    Streaming decimation by factor through an FIR filter: output m is
+    sum_j taps[j] * x[m * factor + delay - j], i.e. the filter output aligned
+    by delay, sampled at every factor-th input. Only the kept outputs are
+    computed, one strided pass per non-zero tap.
+    """
+
+    def __init__(self, taps, factor, delay=None):
+        self.taps = np.asarray(taps, dtype=np.float64)
+        self.factor = factor
+        self.delay = (len(self.taps) - 1) // 2 if delay is None else delay
+        self.nonzero = np.flatnonzero(self.taps)
+        self.reset()
+
+    def reset(self):
+        # buffer[0] is input sample number self.base; earlier samples are zeros
+        history = len(self.taps) - 1 - self.delay
+        self.buffer = np.zeros(max(history, 0))
+        self.base = -len(self.buffer)
+        self.next_output = 0
+        self.num_inputs = 0
+
+    def process(self, block):
+        block = np.asarray(block)
+        self.num_inputs += len(block)
+        if self.buffer.dtype != np.result_type(self.buffer, block):
+            self.buffer = self.buffer.astype(np.result_type(self.buffer, block))
+        self.buffer = np.concatenate((self.buffer, block))
+        return self._emit(self.base + len(self.buffer) - 1)
+
+    def flush(self):
+        """Emit the outputs still waiting for look-ahead, padding the input with zeros."""
+        num_outputs = -(-self.num_inputs // self.factor)
+        last_needed = (num_outputs - 1) * self.factor + self.delay
+        padding = max(last_needed - (self.base + len(self.buffer) - 1), 0)
+        self.buffer = np.concatenate((self.buffer, np.zeros(padding, dtype=self.buffer.dtype)))
+        return self._emit(last_needed)
+
+    def _emit(self, last_index):
+        count = (last_index - self.delay) // self.factor - self.next_output + 1
+        if count <= 0:
+            return np.zeros(0, dtype=self.buffer.dtype)
+
+        output = np.zeros(count, dtype=np.result_type(self.buffer, self.taps))
+        first = self.next_output * self.factor + self.delay - self.base
+        stop = first + (count - 1) * self.factor + 1
+        for j in self.nonzero:
+            output += self.taps[j] * self.buffer[first - j:stop - j:self.factor]
+
+        self.next_output += count
+        # Keep only the samples the next output can still reach
+        keep_from = min(self.next_output * self.factor + self.delay - (len(self.taps) - 1) - self.base,
+                        len(self.buffer))
+        if keep_from > 0:
+            self.buffer = self.buffer[keep_from:]
+            self.base += keep_from
+        return output
+
+
+class CICStage:
+    """
+    Cascaded integrator-comb decimator of the given order: order running sums
+    of length factor, then every factor-th sample, scaled by factor ** -order.
+    Needs only additions. Running sums are computed per block with a carried
+    history, so rounding errors do not accumulate over a long stream.
+    """
+
+    def __init__(self, factor, order):
+        self.factor = factor
+        self.order = order
+        self.picker = _DecimatingStage([float(factor) ** -order], factor, delay=order * (factor - 1) // 2)
+        self.reset()
+
+    def reset(self):
+        self.histories = [np.zeros(self.factor - 1) for _ in range(self.order)]
+        self.picker.reset()
+
+    def process(self, block):
+        for index in range(self.order):
+            history = self.histories[index]
+            extended = np.concatenate((history, block))
+            sums = np.cumsum(np.concatenate(([0], extended)))
+            block = sums[self.factor:] - sums[:len(extended) - self.factor + 1]
+            self.histories[index] = extended[len(extended) - len(history):]
+        return self.picker.process(block)
+
+    def flush(self):
+        # The running sums are causal, so the look-ahead of the picker is just more input
+        num_inputs = self.picker.num_inputs
+        tail = self.process(np.zeros(self.picker.delay))
+        self.picker.num_inputs = num_inputs
+        return np.concatenate((tail, self.picker.flush()))
+
+    def response(self, frequencies, input_rate):
+        """Magnitude response at the given frequencies (Hz)."""
+        x = np.asarray(frequencies, dtype=np.float64) / input_rate
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.sin(np.pi * x * self.factor) / (self.factor * np.sin(np.pi * x))
+        return np.abs(np.where(np.sin(np.pi * x) == 0, 1.0, ratio)) ** self.order
+
+    def describe(self):
+        return f"CIC(R={self.factor}, N={self.order})"
+
+
+class FIRStage(_DecimatingStage):
+    """Kaiser-windowed low-pass FIR followed by decimation by factor."""
+
+    def __init__(self, num_taps, beta, cutoff, factor):
+        # design_lowpass_filter cuts off at rate / K, with cutoff given as a fraction of the rate
+        taps = design_lowpass_filter(num_taps, 1 / cutoff, window_type='kaiser', beta=beta)
+        super().__init__(taps / np.sum(taps), factor)
+
+    def describe(self):
+        return f"FIR({len(self.taps)} taps, /{self.factor})"
+
+
+class HalfBandStage(FIRStage):
+    """Half-band FIR (cut-off at a quarter of the rate, every other tap zero) decimating by 2."""
+
+    def __init__(self, num_taps, beta):
+        super().__init__(num_taps, beta, 0.25, 2)
+        # Clear the rounding residue of the taps that are zero by design
+        offsets = np.arange(len(self.taps)) - (len(self.taps) - 1) // 2
+        self.taps[(offsets % 2 == 0) & (offsets != 0)] = 0.0
+        self.nonzero = np.flatnonzero(self.taps)
+
+    def describe(self):
+        return f"HB({len(self.taps)} taps)"
+
+
+class DecimationPlan:
+    """
+    A chain of decimation stages, run as one streaming pipeline.
+    cost is the estimated number of arithmetic operations per input sample.
+    """
+
+    def __init__(self, stages, input_rate, cost):
+        self.stages = stages
+        self.input_rate = input_rate
+        self.cost = cost
+        self.factor = int(np.prod([stage.factor for stage in stages]))
+
+    def describe(self):
+        return ' -> '.join(stage.describe() for stage in self.stages)
+
+    def process_blocks(self, blocks):
+        """Decimate a sequence of sample blocks, yielding output blocks as they become available."""
+        for stage in self.stages:
+            stage.reset()
+        for block in blocks:
+            for stage in self.stages:
+                block = stage.process(block)
+            if len(block):
+                yield block
+
+        # Flush the stages in order; what one flushes is still input for the next
+        block = np.zeros(0)
+        for stage in self.stages:
+            block = np.concatenate((stage.process(block), stage.flush()))
+        if len(block):
+            yield block
+
+    def apply(self, signal, block_size=65536):
+        signal = np.asarray(signal)
+        blocks = (signal[start:start + block_size] for start in range(0, len(signal), block_size))
+        output = list(self.process_blocks(blocks))
+        return np.concatenate(output) if output else np.zeros(0)
+
+
+def _divisors(n):
+    small = [d for d in range(1, int(np.sqrt(n)) + 1) if n % d == 0]
+    return sorted(set(small + [n // d for d in small]))
+
+
+def plan_decimation(input_rate, output_rate, passband=0.8, ripple_db=0.1, attenuation_db=80.0):
+    """
+    Find the cheapest CIC + half-band + FIR split of the integer ratio
+    input_rate / output_rate that keeps [0, passband * output_rate / 2]
+    within ripple_db and attenuates everything that aliases into that band by
+    at least attenuation_db. As usual, aliasing into the transition band up to
+    output_rate / 2 is allowed. Returns a DecimationPlan.
+    """
+    ratio = input_rate / output_rate
+    factor = int(round(ratio))
+    if factor < 2 or abs(ratio - factor) > 1e-9 * ratio:
+        raise ValueError("Decimation needs an integer rate ratio of at least 2.")
+
+    passband_edge = passband * output_rate / 2
+    ripple = 10 ** (ripple_db / 20) - 1  # peak passband deviation, shared by the stages
+
+    def filter_taps(stage_input_rate, stage_output_rate, stage_ripple):
+        # Pass [0, passband_edge] and stop what folds onto it: from stage_output_rate - passband_edge
+        transition = (stage_output_rate - 2 * passband_edge) / stage_input_rate
+        return kaiser_parameters(max(attenuation_db, -20 * np.log10(stage_ripple)), transition)
+
+    def filter_chain(rate, remaining, stage_ripple):
+        # Every way of splitting the remaining factor into half-bands and a final FIR of factor >= 2
+        halfbands = 0
+        while True:
+            final_factor = remaining // 2 ** halfbands
+            share = stage_ripple / (halfbands + 1)
+            stages, cost, stage_rate = [], 0.0, rate
+            for _ in range(halfbands):
+                num_taps, beta = filter_taps(stage_rate, stage_rate / 2, share)
+                num_taps += (3 - num_taps) % 4  # 4k + 3 taps keep the zero pattern
+                stages.append(('HB', num_taps, beta))
+                cost += 2 * ((num_taps + 3) // 2) * stage_rate / 2
+                stage_rate /= 2
+            num_taps, beta = filter_taps(stage_rate, stage_rate / final_factor, share)
+            num_taps += 1 - num_taps % 2
+            stages.append(('FIR', num_taps, beta, final_factor))
+            yield stages, cost + 2 * num_taps * stage_rate / final_factor
+
+            if final_factor % 2 or final_factor // 2 < 2:
+                return
+            halfbands += 1
+
+    candidates = [(cost, stages) for stages, cost in filter_chain(float(input_rate), factor, ripple)]
+    for cic_factor in _divisors(factor)[1:]:
+        remaining = factor // cic_factor
+        if remaining < 2:
+            continue
+        cic_rate = input_rate / cic_factor
+        for order in range(1, CIC_MAX_ORDER + 1):
+            cic = CICStage(cic_factor, order)
+            droop = 1 - cic.response(passband_edge, input_rate)
+            alias = cic.response(cic_rate - passband_edge, input_rate)
+            if droop > ripple / 2:
+                break  # higher orders only droop more
+            if 20 * np.log10(max(alias, 1e-300)) <= -attenuation_db:
+                # The lowest order that suppresses the first alias band is the cheapest
+                cic_cost = 2 * order * input_rate + cic_rate
+                for stages, cost in filter_chain(cic_rate, remaining, ripple - droop):
+                    candidates.append((cic_cost + cost, [('CIC', cic_factor, order)] + stages))
+                break
+
+    cost, specs = min(candidates, key=lambda candidate: candidate[0])
+    stages = []
+    for spec in specs:
+        if spec[0] == 'CIC':
+            stages.append(CICStage(spec[1], spec[2]))
+        elif spec[0] == 'HB':
+            stages.append(HalfBandStage(spec[1], spec[2]))
+        else:
+            # Cut-off half-way between the passband edge and the first folding band
+            stages.append(FIRStage(spec[1], spec[2], 1 / (2 * spec[3]), spec[3]))
+    return DecimationPlan(stages, input_rate, cost / input_rate)
+
+
+def decimate(signal, metadata, target_frequency, passband=0.8, ripple_db=0.1, attenuation_db=80.0):
+    """
+    Reduce the sampling rate by a large integer factor with the cheapest
+    multi-stage plan from plan_decimation().
+    """
+    original_fs = metadata['sampling_freq']
+    plan = plan_decimation(original_fs, target_frequency, passband, ripple_db, attenuation_db)
+    decimated_signal = plan.apply(signal)
+
+    decimated_metadata = metadata.copy()
+    decimated_metadata['sampling_freq'] = original_fs / plan.factor
+    decimated_metadata['num_samples'] = len(decimated_signal)
+    decimated_metadata['decimation_plan'] = plan.describe()
+    return decimated_signal, decimated_metadata
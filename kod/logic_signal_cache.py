@@ -0,0 +1,84 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Default memory budget of the decoded-signal cache
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+
+class SignalCache:
+    """
+    Process-wide LRU cache of loaded signals, keyed by (path, size, mtime), so
+    a file that changes on disk is never served stale. Entries are evicted,
+    least recently used first, once their arrays exceed max_bytes. Cached
+    arrays are read-only, since every caller shares them.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_key(filename):
+        stat = os.stat(filename)
+        return os.path.abspath(filename), stat.st_size, stat.st_mtime_ns
+
+    def get(self, *keys):
+        """
+        Return the cached (metadata, signal_data) for the first of keys that is
+        present, or None. Counts one hit or miss per call.
+        """
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    metadata, signal_data = entry
+                    return dict(metadata), signal_data
+            self.misses += 1
+            return None
+
+    def put(self, key, metadata, signal_data):
+        size = signal_data.nbytes
+        if size > self.max_bytes:
+            return
+        signal_data.flags.writeable = False
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1].nbytes
+            self._entries[key] = (dict(metadata), signal_data)
+            self._size += size
+            self._evict()
+
+    def invalidate(self, filename):
+        """Drop every entry for filename, e.g. after it was rewritten."""
+        path = os.path.abspath(filename)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                self._size -= self._entries.pop(key)[1].nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def resize(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def stats(self):
+        """Counters for tuning the budget: hits, misses, entries and bytes held."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries),
+                    'bytes': self._size, 'max_bytes': self.max_bytes}
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            _, (_, signal_data) = self._entries.popitem(last=False)
+            self._size -= signal_data.nbytes
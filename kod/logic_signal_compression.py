@@ -0,0 +1,203 @@
+import lzma
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Number of samples per independently compressed block
+COMPRESSION_BLOCK_SIZE = 65536
+
+# Stdlib codecs available for block compression: (compress, decompress).
+# Both release the GIL, so blocks can be (de)compressed in a thread pool.
+CODECS = {
+    'zlib': (zlib.compress, zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+}
+
+# Codec for quantized signals (see rice_encode), which needs the quantization
+# parameters {'min_value': ..., 'step_size': ...} of the signal
+RICE = 'rice'
+
+
+def shuffle_bytes(samples):
+    """
+    Byte-shuffle filter: store byte 0 of every sample, then byte 1, and so on.
+    Slowly changing samples then turn into long runs that compress well.
+    """
+    samples = np.ascontiguousarray(samples)
+    return samples.view(np.uint8).reshape(len(samples), samples.dtype.itemsize).T.tobytes()
+
+
+def unshuffle_bytes(data, dtype):
+    """Invert shuffle_bytes() and return the samples as an array of dtype."""
+    dtype = np.dtype(dtype)
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(planes.T).view(dtype).ravel()
+
+
+def _check_codec(codec, quantization):
+    if codec == RICE:
+        if quantization is None:
+            raise ValueError("The rice codec needs the min_value and step_size of a quantized signal.")
+    elif codec not in CODECS:
+        raise ValueError(f"Unsupported compression codec: {codec}")
+
+
+def compress_blocks(samples, codec='zlib', block_size=COMPRESSION_BLOCK_SIZE, shuffle=True, max_workers=None,
+                    quantization=None):
+    """
+    Split samples into blocks of block_size samples and compress each one
+    independently. Returns the list of compressed blocks.
+    """
+    _check_codec(codec, quantization)
+
+    if codec == RICE:
+        codes = quantization_codes(samples, quantization['min_value'], quantization['step_size'])
+
+        def compress_block(start):
+            return rice_encode(codes[start:start + block_size])
+    else:
+        compress = CODECS[codec][0]
+
+        def compress_block(start):
+            block = samples[start:start + block_size]
+            data = shuffle_bytes(block) if shuffle else np.ascontiguousarray(block).tobytes()
+            return compress(data)
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(compress_block, range(0, len(samples), block_size)))
+
+
+def decompress_blocks(chunks, out, codec='zlib', block_size=COMPRESSION_BLOCK_SIZE, shuffle=True,
+                      max_workers=None, quantization=None):
+    """
+    Decompress consecutive blocks produced by compress_blocks() into out, in
+    parallel. out must hold exactly the samples of those blocks.
+    """
+    _check_codec(codec, quantization)
+
+    def decompress_block(index):
+        target = out[index * block_size:(index + 1) * block_size]
+        if codec == RICE:
+            codes = rice_decode(chunks[index])
+            target[:] = dequantize_codes(codes, quantization['min_value'], quantization['step_size'])
+            return
+        data = CODECS[codec][1](chunks[index])
+        if shuffle:
+            target[:] = unshuffle_bytes(data, out.dtype)
+        else:
+            target[:] = np.frombuffer(data, dtype=out.dtype)
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        # list() re-raises any exception from the workers
+        list(executor.map(decompress_block, range(len(chunks))))
+    return out
+
+
+def checksum_blocks(blocks, max_workers=None):
+    """CRC32 of every block (any bytes-like object), computed in parallel; zlib.crc32 releases the GIL."""
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(zlib.crc32, blocks))
+
+
+# Lossless codec for quantized signals, in the style of FLAC: every block is
+# converted to integer level codes, predicted with the best fixed polynomial
+# predictor (order 0-3, i.e. the order-th difference) and the residuals are
+# Rice coded. The unary quotients and the fixed-width remainders are kept in
+# two separate bit streams, so both encoding and decoding vectorize.
+RICE_MAX_ORDER = 3
+_RICE_BLOCK_HEADER = struct.Struct('<IBBI')  # samples, predictor order, rice parameter, unary stream bytes
+
+
+def quantization_codes(samples, min_value, step_size):
+    """
+    Return the integer level codes of a signal produced by quantize(), or raise
+    ValueError if the samples are not exactly min_value + code * step_size.
+    """
+    codes = np.round((samples - min_value) / step_size).astype(np.int64)
+    if not np.array_equal(dequantize_codes(codes, min_value, step_size), samples):
+        raise ValueError("Signal is not quantized with the given min_value and step_size.")
+    return codes
+
+
+def rice_compatible(samples, metadata):
+    """
+    Whether the samples can be stored with the rice codec: float64 outputs of
+    quantize() whose metadata has a finite, positive step_size they lie on.
+    """
+    step_size = metadata.get('step_size')
+    if (getattr(samples, 'dtype', None) != np.float64 or 'min_value' not in metadata
+            or step_size is None or not (np.isfinite(step_size) and step_size > 0)):
+        return False
+    try:
+        quantization_codes(samples, float(metadata['min_value']), float(step_size))
+    except ValueError:
+        return False
+    return True
+
+
+def dequantize_codes(codes, min_value, step_size):
+    # Same arithmetic as quantize(), so the reconstruction is bit-exact
+    return codes.astype(np.float64) * step_size + min_value
+
+
+def rice_encode(codes):
+    """Encode one block of integer codes into bytes."""
+    codes = np.asarray(codes, dtype=np.int64)
+    order = min(RICE_MAX_ORDER, len(codes))
+
+    # Pick the fixed predictor with the smallest residual magnitude
+    costs = [np.sum(np.abs(np.diff(codes, n=p))) for p in range(order + 1)]
+    order = int(np.argmin(costs))
+    residuals = np.diff(codes, n=order)
+
+    # Zigzag-map signed residuals to unsigned values: 0, -1, 1, -2, ... -> 0, 1, 2, 3, ...
+    values = ((residuals << 1) ^ (residuals >> 63)).view(np.uint64)
+
+    # Rice parameter minimising the total length sum(q) + n * (k + 1)
+    mean = float(np.mean(values)) if len(values) else 0.0
+    estimate = max(int(np.log2(mean + 1)), 0)
+    candidates = range(max(estimate - 2, 0), min(estimate + 3, 64))
+    k = min(candidates, key=lambda c: int(np.sum(values >> np.uint64(c))) + len(values) * (c + 1))
+
+    quotients = (values >> np.uint64(k)).astype(np.int64)
+    unary = np.zeros(int(np.sum(quotients)) + len(quotients), dtype=np.uint8)
+    unary[np.cumsum(quotients + 1) - 1] = 1
+    unary_bytes = np.packbits(unary).tobytes()
+
+    shifts = np.arange(k - 1, -1, -1, dtype=np.uint64)
+    remainder_bits = ((values[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+    remainder_bytes = np.packbits(remainder_bits.ravel()).tobytes()
+
+    return (_RICE_BLOCK_HEADER.pack(len(codes), order, k, len(unary_bytes)) +
+            codes[:order].astype('<i8').tobytes() + unary_bytes + remainder_bytes)
+
+
+def rice_decode(data):
+    """Decode one block produced by rice_encode() back to int64 codes."""
+    num_samples, order, k, unary_size = _RICE_BLOCK_HEADER.unpack_from(data)
+    position = _RICE_BLOCK_HEADER.size
+    warmup = np.frombuffer(data, dtype='<i8', count=order, offset=position).astype(np.int64)
+    position += 8 * order
+    num_values = num_samples - order
+
+    unary = np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=unary_size, offset=position))
+    position += unary_size
+    stops = np.flatnonzero(unary)[:num_values]
+    quotients = np.diff(stops, prepend=-1) - 1
+
+    remainder_bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8, offset=position))[:num_values * k]
+    weights = np.left_shift(1, np.arange(k - 1, -1, -1, dtype=np.int64))
+    remainders = remainder_bits.reshape(num_values, k).astype(np.int64) @ weights
+
+    values = (quotients << k) | remainders
+    residuals = (values >> 1) ^ -(values & 1)
+
+    # Undo the differencing: integrate once per predictor order, starting from the warm-up samples
+    codes = residuals
+    for j in range(order - 1, -1, -1):
+        initial = np.diff(warmup, n=j)[0]
+        codes = np.concatenate(([initial], initial + np.cumsum(codes)))
+    return codes
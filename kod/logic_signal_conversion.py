@@ -5,10 +5,30 @@ from sympy.physics.control.control_plots import matplotlib
 matplotlib.use('TkAgg')  # Set the backend
 
 import numpy as np
+from fractions import Fraction
+from math import gcd
+from functools import lru_cache
 
 
-def sample(signal, metadata, target_freq):
+# Filter taps per polyphase branch on each side of the centre in sample()
+SAMPLE_FILTER_HALF_LENGTH = 10
+
+# Largest denominator of the resampling ratio L/M used by sample()
+SAMPLE_MAX_DENOMINATOR = 10 ** 6
+
+# Number of output samples computed per vectorized block in sample()
+SAMPLE_BLOCK_SIZE = 16384
 
+
+def sample(signal, metadata, target_freq):
+    """
+    Resample the signal to a lower rate with a polyphase rational resampler:
+    conceptually upsample by L, low-pass filter (anti-aliasing, see
+    design_lowpass_filter) and keep every M-th sample, where L / M is the
+    ratio of the rates. Only the kept samples are computed, each from the
+    filter branch (phase) that lines up with it, so the cost grows with the
+    output length. The metadata reports the rate actually produced.
+    """
     # Extract the original sampling frequency from the metadata
     original_freq = metadata.get('sampling_freq', None)
     if original_freq is None:
@@ -18,18 +38,134 @@ def sample(signal, metadata, target_freq):
     downsampling_factor = original_freq / target_freq
     if downsampling_factor < 1:
         raise ValueError("Target frequency must be lower than the original frequency.")
-    # print("Downsampling: ", downsampling_factor)
-    # Perform the downsampling by selecting every nth sample
-    downsampled_signal = signal[::int(downsampling_factor)]
+
+    ratio = (Fraction(str(target_freq)) / Fraction(str(original_freq))).limit_denominator(SAMPLE_MAX_DENOMINATOR)
+    up, down = ratio.numerator, ratio.denominator
+
+    # Polyphase branches of a Hann-windowed low-pass on the upsampled rate with its
+    # cut-off at the lower of the two Nyquist frequencies. Up to SAMPLE_BLOCK_SIZE
+    # branches are tabulated once; beyond that each block evaluates just the ones it uses
+    num_taps = 2 * SAMPLE_FILTER_HALF_LENGTH * max(up, down) + 1
+    branch_length = -(-num_taps // up)
+    branches = _sample_branches(np.arange(up), up, down) if up <= SAMPLE_BLOCK_SIZE else None
+
+    signal = np.asarray(signal)
+    num_outputs = -(-len(signal) * up // down)
+    delay = (num_taps - 1) // 2  # centre of the filter, in upsampled samples
+    padded = np.concatenate((np.zeros(branch_length - 1, dtype=signal.dtype), signal,
+                             np.zeros(delay // up + 1, dtype=signal.dtype)))
+    tap_windows = np.lib.stride_tricks.sliding_window_view(padded, branch_length)
+
+    downsampled_signal = np.empty(num_outputs, dtype=np.result_type(signal.dtype, np.float64))
+    for start in range(0, num_outputs, SAMPLE_BLOCK_SIZE):
+        # Output m sits at upsampled position m * down; shift by the filter delay
+        positions = np.arange(start, min(start + SAMPLE_BLOCK_SIZE, num_outputs)) * down + delay
+        phases = positions % up
+        block_branches = branches[phases] if branches is not None else _sample_branches(phases, up, down)
+        downsampled_signal[start:start + len(positions)] = np.einsum(
+            'ij,ij->i', block_branches, tap_windows[positions // up])
 
     new_metadata = metadata.copy()
-    new_metadata['sampling_freq'] = target_freq  # New frequency
+    new_metadata['sampling_freq'] = original_freq * up / down  # Rate actually produced
     new_metadata['num_samples'] = len(downsampled_signal)  # Update number of samples
 
     return downsampled_signal, new_metadata
 
 
-def quantize(signal, metadata, num_levels=16):
+def _sample_branches(phases, up, down):
+    """
+    Taps of the polyphase branches `phases` of sample()'s anti-aliasing filter,
+    one row per phase, reversed to line up with ascending input samples. The
+    prototype is the windowed sinc of design_lowpass_filter(num_taps, 2 * max(up,
+    down), 'hann'), evaluated only at the taps of these branches; each branch is
+    scaled to unit sum, so that every output phase has unit gain at DC.
+    """
+    half_length = SAMPLE_FILTER_HALF_LENGTH * max(up, down)
+    num_taps = 2 * half_length + 1
+    branch_length = -(-num_taps // up)
+
+    # Branch p holds taps p, p + up, p + 2 * up, ... of the prototype
+    taps = phases[:, np.newaxis] + np.arange(branch_length - 1, -1, -1) * up
+    branches = np.sinc((taps - half_length) / max(up, down))
+    branches *= 0.5 - 0.5 * np.cos(2 * np.pi * taps / num_taps)
+    branches[taps >= num_taps] = 0
+    branches /= branches.sum(axis=1, keepdims=True)
+    return branches
+
+
+# Samples per pass of the integer-code quantizer, small enough to stay in cache
+QUANTIZE_BLOCK_SIZE = 65536
+
+# Most levels a QuantizedSignal can hold: its codes are at most 16 bits wide
+MAX_QUANTIZATION_LEVELS = 1 << 16
+
+# Companding laws supported by quantize() and their standard parameters
+COMPANDING_LAWS = ('mu-law', 'a-law')
+MU_LAW_MU = 255.0
+A_LAW_A = 87.6
+
+
+class QuantizedSignal:
+    """
+    Output of quantize(..., codes=True): one uint8 (up to 256 levels) or uint16
+    level code per sample and the descriptor that maps the codes back to
+    values. The values are only materialized on demand, by dequantize(),
+    indexing or np.asarray(), through a lookup table of the levels.
+    """
+
+    def __init__(self, codes, descriptor):
+        self.codes = codes
+        self.descriptor = descriptor
+        self._levels = None
+
+    @property
+    def levels(self):
+        """Value of every code."""
+        if self._levels is None:
+            self._levels = _level_values(self.descriptor)
+        return self._levels
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes
+
+    def dequantize(self):
+        return self.levels[self.codes]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.levels[self.codes[index]]
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.dequantize()
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+
+def quantize(signal, metadata, num_levels=16, codes=False, companding=None, dither=False, seed=None):
+    """
+    Quantize the signal to num_levels levels spread over its range.
+
+    By default the levels are evenly spaced and the float64 values are
+    returned. With codes=True a QuantizedSignal holding the level codes is
+    returned instead, 8 or 4 times smaller than the values. companding
+    ('mu-law' or 'a-law') spaces the levels evenly in the companded domain
+    around the peak amplitude, so quiet samples get finer steps. dither=True
+    adds triangular (TPDF) dither of one step before rounding; seed makes it
+    reproducible.
+    """
+    if np.iscomplexobj(signal) and (codes or companding or dither):
+        raise ValueError("Integer codes, companding and dither need a real signal.")
+    if companding is not None and companding not in COMPANDING_LAWS:
+        raise ValueError(f"Unsupported companding law: {companding}")
+    if codes or companding or dither:
+        quantization_code_dtype(num_levels)
+    signal = np.asarray(signal)
+    if not np.iscomplexobj(signal):
+        # Levels are computed on the float64 grid the metadata describes, also for
+        # float32 input, so the values match min_value + code * step_size exactly
+        signal = signal.astype(np.float64, copy=False)
 
     # Get the range of the signal (min and max values)
     min_val = np.min(signal)
@@ -38,71 +174,645 @@ def quantize(signal, metadata, num_levels=16):
     # Calculate the quantization step size
     step_size = (max_val - min_val) / (num_levels - 1)
 
-    # Perform quantization by scaling the signal and rounding it to the nearest level
-    quantized_signal = np.round((signal - min_val) / step_size) * step_size + min_val
-
     # Update metadata with quantization information
     quantized_metadata = metadata.copy()
     quantized_metadata['num_levels'] = num_levels
     quantized_metadata['min_value'] = min_val
     quantized_metadata['max_value'] = max_val
-    quantized_metadata['step_size'] = step_size
 
-    # print(f"Quantization with {num_levels} levels:")
-    # print(f"Signal range: {min_val} to {max_val}")
-    # print(f"Step size: {step_size}")
+    if not (codes or companding or dither):
+        # Perform quantization by scaling the signal and rounding it to the nearest level
+        quantized_metadata['step_size'] = step_size
+        return _quantize_values(signal, min_val, step_size), quantized_metadata
+
+    descriptor = _quantization_descriptor(num_levels, min_val, max_val, companding)
+    if companding is None:
+        # The step size of companded levels varies, so only linear outputs carry it
+        quantized_metadata['step_size'] = step_size
+    else:
+        quantized_metadata['companding'] = companding
+    if dither:
+        quantized_metadata['dither'] = 'tpdf'
+
+    rng = np.random.default_rng(seed) if dither else None
+    quantized = QuantizedSignal(_quantize_codes(np.asarray(signal), descriptor, rng), descriptor)
+    return (quantized if codes else quantized.dequantize()), quantized_metadata
+
+
+def quantization_code_dtype(num_levels):
+    """Type of the level codes of a QuantizedSignal with num_levels levels: uint8 or uint16."""
+    if num_levels > MAX_QUANTIZATION_LEVELS:
+        raise ValueError(f"Level codes hold at most {MAX_QUANTIZATION_LEVELS} levels, got {num_levels}.")
+    return np.dtype(np.uint8 if num_levels <= 256 else np.uint16)
+
+
+def _quantization_descriptor(num_levels, min_val, max_val, companding=None):
+    """Descriptor of the levels of a QuantizedSignal covering [min_val, max_val]."""
+    quantization_code_dtype(num_levels)
+    if companding is None:
+        return {'num_levels': num_levels, 'min_value': float(min_val),
+                'step_size': float((max_val - min_val) / (num_levels - 1))}
+    return {'num_levels': num_levels, 'companding': companding, 'peak': float(max(abs(min_val), abs(max_val)))}
+
+
+def _quantize_values(signal, min_val, step_size):
+    return np.round((signal - min_val) / step_size) * step_size + min_val
+
+
+def _quantize_codes(signal, descriptor, rng=None):
+    """
+    Level codes of the samples, computed block by block with in-place
+    operations; samples outside the range get the nearest end level. Linear
+    codes give the same levels as _quantize_values(); companded codes are
+    looked up from the sample's position on a fine uniform grid. With a random
+    generator rng, TPDF dither is added.
+    """
+    num_levels = descriptor['num_levels']
+    codes = np.empty(len(signal), dtype=quantization_code_dtype(num_levels))
+
+    if 'companding' in descriptor:
+        encode, local_steps, grid_step = _companding_tables(descriptor['companding'], num_levels)
+        # Grid index of x: (x + peak) / (peak * grid_step)
+        offset, scale = descriptor['peak'], descriptor['peak'] * grid_step
+    else:
+        offset, scale = descriptor['min_value'], descriptor['step_size']
+        encode = None
+    if scale == 0:
+        # A constant signal: every sample is the lowest level
+        codes[:] = 0
+        return codes
+
+    buffer = np.empty(min(QUANTIZE_BLOCK_SIZE, len(signal)))
+    for start in range(0, len(signal), QUANTIZE_BLOCK_SIZE):
+        block = signal[start:start + QUANTIZE_BLOCK_SIZE]
+        position = buffer[:len(block)]
+        if encode is None:
+            np.subtract(block, offset, out=position)
+            position /= scale
+            if rng is not None:
+                position += rng.random(len(block))
+                position -= rng.random(len(block))
+            np.rint(position, out=position)
+            np.clip(position, 0, num_levels - 1, out=position)
+            codes[start:start + len(block)] = position
+        else:
+            np.add(block, offset, out=position)
+            position /= scale
+            if rng is not None:
+                # Dither by one companded step, converted to grid units at the sample
+                steps = local_steps[np.clip(np.rint(position), 0, len(local_steps) - 1).astype(np.intp)]
+                steps *= rng.random(len(block)) - rng.random(len(block))
+                position += steps
+            np.rint(position, out=position)
+            np.clip(position, 0, len(encode) - 1, out=position)
+            codes[start:start + len(block)] = encode[position.astype(np.intp)]
+    return codes
+
+
+def _level_values(descriptor):
+    """Value of every level code of a quantize() descriptor."""
+    num_levels = descriptor['num_levels']
+    if 'companding' not in descriptor:
+        return np.arange(num_levels, dtype=np.float64) * descriptor['step_size'] + descriptor['min_value']
+    levels = np.linspace(-1.0, 1.0, num_levels)
+    return _expand(levels, descriptor['companding']) * descriptor['peak']
+
+
+@lru_cache(maxsize=16)
+def _companding_tables(law, num_levels):
+    """
+    Lookup tables of a companding quantizer over a uniform grid of x in
+    [-1, 1]: the code of every grid point, and the width of one companded step
+    at every grid point, in grid units. Returns (encode, local_steps, spacing).
+    """
+    # Enough grid points that the finest step (at x = 0, of width 2 / (L - 1) / F'(0))
+    # spans dozens of them, capped at 2 ** 22 points
+    slope = MU_LAW_MU / np.log1p(MU_LAW_MU) if law == 'mu-law' else A_LAW_A / (1 + np.log(A_LAW_A))
+    num_points = 2 ** int(np.clip(np.ceil(np.log2(32 * (num_levels - 1) * slope)), 14, 22)) + 1
+    spacing = 2.0 / (num_points - 1)
+    x = np.linspace(-1.0, 1.0, num_points)
+    y = _compress(x, law)
+    encode = np.rint((y + 1) * (num_levels - 1) / 2).astype(quantization_code_dtype(num_levels))
+
+    # dx = dy / F'(x), with one companded step dy = 2 / (L - 1)
+    derivative = np.gradient(y, spacing)
+    local_steps = 2.0 / (num_levels - 1) / derivative / spacing
+    encode.flags.writeable = False
+    local_steps.flags.writeable = False
+    return encode, local_steps, spacing
+
+
+def _compress(x, law):
+    """Companding characteristic F(x) on [-1, 1]."""
+    magnitude = np.abs(x)
+    if law == 'mu-law':
+        y = np.log1p(MU_LAW_MU * magnitude) / np.log1p(MU_LAW_MU)
+    else:
+        scale = 1 + np.log(A_LAW_A)
+        y = np.where(magnitude < 1 / A_LAW_A, A_LAW_A * magnitude / scale,
+                     (1 + np.log(np.maximum(A_LAW_A * magnitude, 1.0))) / scale)
+    return np.sign(x) * y
+
+
+def _expand(y, law):
+    """Inverse of _compress()."""
+    magnitude = np.abs(y)
+    if law == 'mu-law':
+        x = np.expm1(magnitude * np.log1p(MU_LAW_MU)) / MU_LAW_MU
+    else:
+        scale = 1 + np.log(A_LAW_A)
+        x = np.where(magnitude < 1 / scale, magnitude * scale / A_LAW_A,
+                     np.exp(magnitude * scale - 1) / A_LAW_A)
+    return np.sign(y) * x
+
+
+def signal_range(blocks):
+    """Return (min, max) over a sequence of sample blocks in a single pass."""
+    min_val = np.inf
+    max_val = -np.inf
+    for block in blocks:
+        if len(block):
+            min_val = min(min_val, np.min(block))
+            max_val = max(max_val, np.max(block))
+    return min_val, max_val
+
+
+def quantize_blocks(blocks, min_val, max_val, num_levels=16):
+    """
+    Block-wise variant of quantize(). The range has to be known up front,
+    e.g. from signal_range() over a first pass; with the signal's own min and
+    max the concatenated output equals quantize(signal, ...).
+    """
+    step_size = (max_val - min_val) / (num_levels - 1)
+    for block in blocks:
+        yield _quantize_values(block, min_val, step_size)
+
+
+# Margin added on each side of the range estimated by StreamingQuantizer, as a
+# fraction of the width of the first block's range
+QUANTIZE_HEADROOM = 0.25
+
+
+class StreamingQuantizer:
+    """
+    Single-pass quantizer for a stream of blocks, with the options of
+    quantize(). The range [min_value, max_value] is fixed up front, e.g. from
+    the 'min_value' / 'max_value' of a file header; without it the range of the
+    first block, widened by headroom on both sides, is used. Samples outside
+    the range are clipped to the end levels and counted, so a wrong range
+    shows up in the 'saturated_low' / 'saturated_high' metadata entries.
+
+        quantizer = StreamingQuantizer(16, min_value, max_value)
+        for block in blocks:
+            output = quantizer.process(block)
+        quantized_metadata = quantizer.update_metadata(metadata)
+    """
+
+    def __init__(self, num_levels=16, min_value=None, max_value=None, codes=False, companding=None, dither=False,
+                 seed=None, headroom=QUANTIZE_HEADROOM):
+        if companding is not None and companding not in COMPANDING_LAWS:
+            raise ValueError(f"Unsupported companding law: {companding}")
+        if (min_value is None) != (max_value is None):
+            raise ValueError("Give both ends of the quantization range, or neither.")
+        quantization_code_dtype(num_levels)  # Every block goes through level codes
+        self.num_levels = num_levels
+        self.codes = codes
+        self.companding = companding
+        self.dither = dither
+        self.headroom = headroom
+        self.range_estimated = min_value is None
+        self.descriptor = None
+        self.rng = np.random.default_rng(seed) if dither else None
+        if min_value is not None:
+            self._set_range(min_value, max_value)
+        self.num_samples = 0
+        self.saturated_low = 0
+        self.saturated_high = 0
+
+    def _set_range(self, min_value, max_value):
+        if max_value < min_value:
+            raise ValueError("The quantization range is empty.")
+        self.min_value = float(min_value)
+        self.max_value = float(max_value)
+        self.descriptor = _quantization_descriptor(self.num_levels, min_value, max_value, self.companding)
+        self.levels = _level_values(self.descriptor)
+        if self.companding is None:
+            self.low, self.high = self.min_value, self.max_value
+        else:
+            self.low, self.high = -self.descriptor['peak'], self.descriptor['peak']
+
+    def process(self, block):
+        """Quantize the next block; returns a QuantizedSignal with codes=True, else the values."""
+        block = np.asarray(block)
+        if np.iscomplexobj(block):
+            raise ValueError("Only real signals can be quantized in a stream.")
+        if self.descriptor is None:
+            if not len(block):
+                # Nothing to estimate the range from yet
+                empty = np.zeros(0, dtype=np.uint8)
+                return QuantizedSignal(empty, _quantization_descriptor(self.num_levels, 0.0, 0.0, self.companding)) \
+                    if self.codes else empty.astype(np.float64)
+            low, high = np.min(block), np.max(block)
+            margin = self.headroom * (high - low)
+            self._set_range(low - margin, high + margin)
+
+        self.num_samples += len(block)
+        self.saturated_low += int(np.count_nonzero(block < self.low))
+        self.saturated_high += int(np.count_nonzero(block > self.high))
+        codes = _quantize_codes(block, self.descriptor, self.rng)
+        return QuantizedSignal(codes, self.descriptor) if self.codes else self.levels[codes]
+
+    def update_metadata(self, metadata):
+        """Return a copy of metadata with the quantization parameters and the saturation counters."""
+        quantized_metadata = metadata.copy()
+        quantized_metadata['num_levels'] = self.num_levels
+        if self.descriptor is not None:
+            quantized_metadata['min_value'] = self.min_value
+            quantized_metadata['max_value'] = self.max_value
+            if self.companding is None:
+                quantized_metadata['step_size'] = self.descriptor['step_size']
+        if self.companding is not None:
+            quantized_metadata['companding'] = self.companding
+        if self.dither:
+            quantized_metadata['dither'] = 'tpdf'
+        quantized_metadata['range_estimated'] = self.range_estimated
+        quantized_metadata['saturated_low'] = self.saturated_low
+        quantized_metadata['saturated_high'] = self.saturated_high
+        return quantized_metadata
+
+
+# Number of input samples handed to the uniform-grid kernels at a time
+HOLD_BLOCK_SIZE = 8192
+
+# Largest output period (M / gcd(N, M)) for which the uniform-grid positions are
+# looked up from a precomputed table instead of being computed per output
+UNIFORM_PERIOD_TABLE_SIZE = 1 << 16
 
-    return quantized_signal, quantized_metadata
 
 def extrapolate(signal, metadata, target_frequency):
-    # Calculate time arrays
-    original_fs = metadata['sampling_freq']
-    duration = len(signal) / original_fs
-    
-    sample_times = np.linspace(0, duration, len(signal), endpoint=False)
-    target_times = np.linspace(0, duration, int(duration * target_frequency), endpoint=False)
-    
-    # Use array indexing for efficiency
-    indices = np.searchsorted(sample_times, target_times, side='right') - 1
-    indices = np.clip(indices, 0, len(signal) - 1)
-    
-    extrapolated_signal = signal[indices]
-    extrapolated_metadata = metadata.copy()
-    extrapolated_metadata['sampling_freq'] = target_frequency
-    extrapolated_metadata['num_samples'] = len(extrapolated_signal)
-    return extrapolated_signal, extrapolated_metadata
+    """Zero-order hold: every output sample repeats the last input sample at or before it."""
+    return _resample_uniform(signal, metadata, target_frequency, extrapolate_blocks)
+
 
 def interpolate(signal, metadata, target_frequency):
-    # Calculate time arrays
+    """First-order hold: linear interpolation between neighbouring input samples."""
+    return _resample_uniform(signal, metadata, target_frequency, interpolate_blocks)
+
+
+def extrapolate_blocks(blocks, metadata, target_frequency):
+    """
+    Block-wise variant of extrapolate(). metadata['num_samples'] must hold the
+    total number of input samples, since it fixes the output grid.
+    """
+    def zero_order_hold(buffer, indices, fractions):
+        return buffer[indices]
+    return _uniform_resample_blocks(blocks, metadata, target_frequency, 0, 0, zero_order_hold)
+
+
+def interpolate_blocks(blocks, metadata, target_frequency):
+    """Block-wise variant of interpolate(), see extrapolate_blocks()."""
+    def first_order_hold(buffer, indices, fractions):
+        current = buffer[indices]
+        output = buffer[1:][indices]
+        output -= current
+        output *= fractions
+        output += current
+        return output
+    return _uniform_resample_blocks(blocks, metadata, target_frequency, 0, 1, first_order_hold)
+
+
+# Number of points of lagrange_interpolate()
+LAGRANGE_POINTS = 4
+
+# Taps, polynomial order and design bandwidth (fraction of the Nyquist
+# frequency) of the Farrow interpolator
+FARROW_TAPS = 8
+FARROW_ORDER = 5
+FARROW_BANDWIDTH = 0.5
+
+
+def cubic_interpolate(signal, metadata, target_frequency):
+    """Cubic (Catmull-Rom) interpolation through the four nearest input samples."""
+    return _resample_uniform(signal, metadata, target_frequency, cubic_interpolate_blocks)
+
+
+def lagrange_interpolate(signal, metadata, target_frequency, num_points=LAGRANGE_POINTS):
+    """Interpolation with the Lagrange polynomial through the num_points nearest input samples."""
+    return _resample_uniform(signal, metadata, target_frequency,
+                             lambda blocks, meta, freq: lagrange_interpolate_blocks(blocks, meta, freq, num_points))
+
+
+def farrow_interpolate(signal, metadata, target_frequency, num_taps=FARROW_TAPS, order=FARROW_ORDER,
+                       bandwidth=FARROW_BANDWIDTH):
+    """
+    Band-limited interpolation with a Farrow structure: a fractional-delay FIR
+    of num_taps taps whose coefficients are polynomials of the given order in
+    the fractional position, so any position costs order + 1 fixed FIR
+    evaluations combined by Horner's rule. It is most accurate for signals
+    below bandwidth * Nyquist frequency.
+    """
+    return _resample_uniform(signal, metadata, target_frequency,
+                             lambda blocks, meta, freq: farrow_interpolate_blocks(blocks, meta, freq, num_taps, order,
+                                                                                  bandwidth))
+
+
+def cubic_interpolate_blocks(blocks, metadata, target_frequency):
+    """Block-wise variant of cubic_interpolate(), see extrapolate_blocks()."""
+    def catmull_rom(buffer, indices, fractions):
+        before, current, after, next_after = (buffer[indices + k] for k in (-1, 0, 1, 2))
+        return current + 0.5 * fractions * (
+            after - before + fractions * (2 * before - 5 * current + 4 * after - next_after +
+                                          fractions * (3 * (current - after) + next_after - before)))
+    return _uniform_resample_blocks(blocks, metadata, target_frequency, 1, 2, catmull_rom)
+
+
+def lagrange_interpolate_blocks(blocks, metadata, target_frequency, num_points=LAGRANGE_POINTS):
+    """Block-wise variant of lagrange_interpolate(), see extrapolate_blocks()."""
+    left = (num_points - 1) // 2
+    nodes = np.arange(-left, num_points - left)
+
+    def lagrange(buffer, indices, fractions):
+        output = 0
+        for k in nodes:
+            weight = 1.0
+            for j in nodes[nodes != k]:
+                weight = weight * (fractions - j) / (k - j)
+            output = output + weight * buffer[indices + k]
+        return output
+    return _uniform_resample_blocks(blocks, metadata, target_frequency, left, num_points - 1 - left, lagrange)
+
+
+def farrow_interpolate_blocks(blocks, metadata, target_frequency, num_taps=FARROW_TAPS, order=FARROW_ORDER,
+                              bandwidth=FARROW_BANDWIDTH):
+    """Block-wise variant of farrow_interpolate(), see extrapolate_blocks()."""
+    left = (num_taps - 1) // 2
+    coefficients = _farrow_coefficients(num_taps, order, bandwidth)
+
+    def farrow(buffer, indices, fractions):
+        taps = np.lib.stride_tricks.sliding_window_view(buffer, num_taps)[indices - left]
+        branches = taps @ coefficients.T  # one fixed FIR per polynomial power
+        output = branches[:, order]
+        for power in range(order - 1, -1, -1):
+            output = output * fractions + branches[:, power]
+        return output
+    return _uniform_resample_blocks(blocks, metadata, target_frequency, left, num_taps - 1 - left, farrow)
+
+
+@lru_cache(maxsize=None)
+def _farrow_coefficients(num_taps, order, bandwidth):
+    """
+    Farrow coefficients: for fractional positions d across [0, 1), the taps
+    of the least-squares fractional-delay filter (best approximation of a
+    delay of d over the band [0, bandwidth * Nyquist]), each fitted with a
+    polynomial in d of the given order. Row p holds the coefficients of d ** p.
+    """
+    left = (num_taps - 1) // 2
+    offsets = np.arange(-left, num_taps - left)
+    fractions = (np.arange(256) + 0.5) / 256
+    # Normal equations of the band-limited least-squares fit, for every fraction at once
+    gram = np.sinc(bandwidth * (offsets[:, None] - offsets))
+    targets = np.sinc(bandwidth * (offsets[:, None] - fractions))
+    taps = np.linalg.solve(gram, targets).T
+    powers = fractions[:, None] ** np.arange(order + 1)
+    coefficients = np.linalg.lstsq(powers, taps, rcond=None)[0]
+    coefficients.setflags(write=False)
+    return coefficients
+
+
+def _resample_uniform(signal, metadata, target_frequency, resample_blocks):
+    signal = np.asarray(signal)
+    block_metadata = dict(metadata, num_samples=len(signal))
+    blocks = (signal[start:start + HOLD_BLOCK_SIZE] for start in range(0, len(signal), HOLD_BLOCK_SIZE))
+
+    # Write every output block straight into its slice of the result
+    num_targets = int(len(signal) / metadata['sampling_freq'] * target_frequency) if len(signal) else 0
+    resampled = np.empty(num_targets, dtype=np.result_type(signal.dtype, np.float64))
+    filled = 0
+    for block in resample_blocks(blocks, block_metadata, target_frequency):
+        resampled[filled:filled + len(block)] = block
+        filled += len(block)
+    resampled = resampled[:filled]
+
+    resampled_metadata = metadata.copy()
+    resampled_metadata['sampling_freq'] = target_frequency
+    resampled_metadata['num_samples'] = len(resampled)
+    return resampled, resampled_metadata
+
+
+def _uniform_resample_blocks(blocks, metadata, target_frequency, left, right, kernel):
+    """
+    Drive a local interpolation kernel over streamed input blocks.
+
+    Both grids are uniform, so output m lies at input position m * N / M
+    (N input and M output samples over the same duration): its base index
+    (m * N) // M and fractional part are computed in integer arithmetic, and
+    no time arrays are built. kernel(buffer, indices, fractions) returns the
+    outputs, where buffer[indices + k] for k = -left .. right are the input
+    samples base - left .. base + right of each output (the edge samples
+    repeated past either end of the signal). Only the samples the next outputs
+    still need are carried between blocks.
+    """
+    num_samples = metadata['num_samples']
+    duration = num_samples / metadata['sampling_freq']
+    num_targets = int(duration * target_frequency)
+
+    # m * N / M = m * n / t in lowest terms; the pattern of bases and fractions
+    # repeats every t outputs, advancing by n inputs
+    divisor = gcd(num_samples, num_targets) or 1
+    step_samples, step_targets = num_samples // divisor, num_targets // divisor
+    if 0 < step_targets <= UNIFORM_PERIOD_TABLE_SIZE:
+        phases = np.arange(step_targets, dtype=np.int64) * step_samples
+        period_bases = phases // step_targets
+        period_fractions = (phases - period_bases * step_targets) / step_targets
+
+    carried = None
+    carried_start = 0  # input index of carried[0]
+    next_target = 0
+
+    def emit(buffer, buffer_start, last_base):
+        # Outputs whose base index is at most last_base, i.e. m * N < (last_base + 1) * M
+        nonlocal next_target
+        stop = min(num_targets, -(-(last_base + 1) * num_targets // num_samples))
+        if stop <= next_target:
+            return None
+        if step_targets <= UNIFORM_PERIOD_TABLE_SIZE:
+            # Whole periods from the one containing next_target, then cut to the outputs
+            first_period = next_target // step_targets
+            periods = np.arange(first_period, -(-stop // step_targets), dtype=np.int64)
+            skip = next_target - first_period * step_targets
+            bases = (periods[:, np.newaxis] * step_samples + (period_bases - buffer_start)).ravel()
+            bases = bases[skip:skip + stop - next_target]
+            fractions = np.tile(period_fractions, len(periods))[skip:skip + stop - next_target]
+        else:
+            # Advance from the first output in steps of n / t; every product stays
+            # below (stop - next_target) * t, far from overflowing int64
+            base, remainder = divmod(next_target * step_samples, step_targets)
+            offsets = np.arange(stop - next_target, dtype=np.int64)
+            carries, remainders = np.divmod(remainder + offsets * (step_samples % step_targets), step_targets)
+            bases = offsets * (step_samples // step_targets) + carries + (base - buffer_start)
+            fractions = remainders / step_targets
+        next_target = stop
+        return kernel(buffer, bases, fractions)
+
+    for block in blocks:
+        block = np.asarray(block)
+        if not len(block):
+            continue
+        if carried is None:
+            # Repeat the first sample to the left of the signal
+            carried = np.repeat(block[:1], left)
+            carried_start = -left
+        buffer = np.concatenate((carried, block))
+        output = emit(buffer, carried_start, carried_start + len(buffer) - 1 - right)
+        if output is not None:
+            yield output
+
+        # Keep what the next output can still reach
+        keep_from = min(next_target * num_samples // num_targets - left - carried_start, len(buffer)) \
+            if num_targets else len(buffer)
+        carried = buffer[keep_from:]
+        carried_start += keep_from
+
+    if carried is not None and next_target < num_targets:
+        # Repeat the last sample to the right of the signal for the remaining outputs
+        buffer = np.concatenate((carried, np.repeat(carried[-1:], right)))
+        output = emit(buffer, carried_start, num_samples - 1)
+        if output is not None:
+            yield output
+
+
+def fft_resample(signal, metadata, target_frequency, edge_mode='periodic'):
+    """
+    Band-limited resampling in the frequency domain: the spectrum is
+    zero-padded (upsampling) or truncated (downsampling) to the target
+    length and transformed back, which is O(N log N).
+
+    edge_mode='periodic' treats the signal as one period, which is exact for
+    periodic signals spanning whole periods. edge_mode='padded' resamples the
+    signal extended by its mirror image instead, so a signal whose ends do
+    not meet does not ring at the edges.
+    """
+    if edge_mode not in ('periodic', 'padded'):
+        raise ValueError(f"Unsupported edge mode: {edge_mode}")
+
     original_fs = metadata['sampling_freq']
     duration = len(signal) / original_fs
-    
-    sample_times = np.linspace(0, duration, len(signal), endpoint=False)
-    target_times = np.linspace(0, duration, int(duration * target_frequency), endpoint=False)
-    
-    interpolated_signal = np.interp(target_times, sample_times, signal)
-    interpolated_metadata = metadata.copy()
-    interpolated_metadata['sampling_freq'] = target_frequency
-    interpolated_metadata['num_samples'] = len(interpolated_signal)
-    
-    return interpolated_signal, interpolated_metadata
-
-def reconstruct(signal, metadata, target_frequency):
+    num_targets = int(duration * target_frequency)
+
+    signal = np.asarray(signal)
+    if edge_mode == 'padded' and len(signal):
+        extended = np.concatenate((signal, signal[::-1]))
+        resampled = _fft_resample(extended, 2 * num_targets)[:num_targets]
+    else:
+        resampled = _fft_resample(signal, num_targets)
+
+    resampled_metadata = metadata.copy()
+    resampled_metadata['sampling_freq'] = target_frequency
+    resampled_metadata['num_samples'] = len(resampled)
+    return resampled, resampled_metadata
+
+
+def _fft_resample(signal, num):
+    """Resample one period of signal to num samples by resizing its spectrum."""
+    length = len(signal)
+    if length == 0 or num == 0:
+        return np.zeros(num, dtype=np.result_type(signal.dtype, np.float64))
+
+    is_real = not np.iscomplexobj(signal)
+    spectrum = np.fft.rfft(signal) if is_real else np.fft.fft(signal)
+    resized = np.zeros(num // 2 + 1 if is_real else num, dtype=np.complex128)
+
+    # Copy the frequencies both lengths can represent
+    kept = min(num, length)
+    nyquist = kept // 2 + 1
+    resized[:nyquist] = spectrum[:nyquist]
+    if not is_real and kept > 2:
+        resized[nyquist - kept:] = spectrum[nyquist - kept:]
+
+    # With an even number of kept bins the Nyquist bin stands for both +f and -f
+    if kept % 2 == 0:
+        if num < length:
+            if is_real:
+                resized[kept // 2] *= 2
+            else:
+                resized[-kept // 2] += spectrum[-kept // 2]
+        elif num > length:
+            resized[kept // 2] *= 0.5
+            if not is_real:
+                resized[num - kept // 2] = resized[kept // 2]
+
+    resampled = np.fft.irfft(resized, num) if is_real else np.fft.ifft(resized)
+    return resampled * (num / length)
+
+
+# Half-width, in input samples, of the windowed-sinc kernel used by reconstruct()
+RECONSTRUCTION_SUPPORT = 16
+
+# Number of output samples evaluated per vectorized block in reconstruct()
+RECONSTRUCTION_BLOCK_SIZE = 16384
+
+
+def reconstruct(signal, metadata, target_frequency, support=RECONSTRUCTION_SUPPORT, exact=False):
+    """
+    Sinc reconstruction of the signal at target_frequency.
+
+    Every output sample is a sum over the 2 * support nearest input samples,
+    weighted by a Hann-windowed sinc, which is O(N * support). exact=True
+    sums the full sinc over every input sample instead (the original O(N * M)
+    definition), for validation on small signals. Output samples are
+    evaluated in vectorized blocks, so memory stays bounded either way.
+    """
     original_fs = metadata['sampling_freq']
     duration = len(signal) / original_fs
-    
-    sample_times = np.linspace(0, duration, len(signal), endpoint=False)
-    target_times = np.linspace(0, duration, int(duration * target_frequency), endpoint=False)
-    
-    reconstructed = np.zeros(len(target_times))
-    T = 1/original_fs  # Sample period
-    
-    for n in range(len(signal)):
-        # Calculate sinc contribution for each sample
-        sinc_values = np.sinc((target_times - sample_times[n]) / T)
-        reconstructed += signal[n] * sinc_values
-        
+    num_targets = int(duration * target_frequency)
+    step = duration / num_targets if num_targets else 0.0  # spacing of the target times
+
+    signal = np.asarray(signal)
+    reconstructed = np.zeros(num_targets, dtype=np.result_type(signal.dtype, np.float64))
+    if exact:
+        sample_times = np.linspace(0, duration, len(signal), endpoint=False)
+        block_size = max(1, (1 << 22) // max(len(signal), 1))
+    else:
+        # Zero-padded so every output sees 2 * support taps without bounds checks
+        padded = np.concatenate((np.zeros(support), signal, np.zeros(support + 1)))
+        tap_windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * support)
+        block_size = RECONSTRUCTION_BLOCK_SIZE
+
+    for start in range(0, num_targets, block_size):
+        target_times = np.arange(start, min(start + block_size, num_targets)) * step
+        if exact:
+            sinc_values = np.sinc((target_times[:, None] - sample_times) * original_fs)
+            reconstructed[start:start + len(target_times)] = sinc_values @ signal
+        else:
+            reconstructed[start:start + len(target_times)] = _windowed_sinc_sum(
+                tap_windows, target_times * original_fs, support)
+
     reconstructed_metadata = metadata.copy()
     reconstructed_metadata['sampling_freq'] = target_frequency
     reconstructed_metadata['num_samples'] = len(reconstructed)
-    return reconstructed, reconstructed_metadata
\ No newline at end of file
+    return reconstructed, reconstructed_metadata
+
+
+def _windowed_sinc_sum(tap_windows, positions, support):
+    """
+    Evaluate the windowed-sinc interpolation at fractional sample positions.
+    tap_windows[i] holds input samples i - support .. i + support - 1 (zero
+    outside the signal), see reconstruct().
+    """
+    base = np.floor(positions).astype(np.int64)
+    fraction = positions - base
+    offsets = np.arange(1 - support, support + 1)
+    distance = fraction[:, None] - offsets  # position minus tap index
+
+    # sin(pi * (fraction - k)) = (-1)^k * sin(pi * fraction), and the Hann window
+    # cos(pi * (fraction - k) / support) expands the same way, so only a few
+    # transcendentals per output sample are needed
+    signs = np.where(offsets % 2 == 0, 1.0, -1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weights = (np.sin(np.pi * fraction)[:, None] * signs) / (np.pi * distance)
+    weights[distance == 0] = 1.0
+    angle = np.pi / support
+    weights *= 0.5 + 0.5 * (np.cos(angle * fraction)[:, None] * np.cos(angle * offsets) +
+                            np.sin(angle * fraction)[:, None] * np.sin(angle * offsets))
+
+    return np.einsum('ij,ij->i', weights, tap_windows[base + 1])
@@ -1,25 +1,98 @@
 from PyQt5.QtWidgets import QMessageBox
 
+import io
 import json
+import os
 import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from logic_signal_conversion import *
 from strings import *
 from filtering import (
-    design_lowpass_filter, design_highpass_filter, apply_filter
+    design_lowpass_filter, design_highpass_filter, design_bandpass_filter, design_bandstop_filter,
+    design_filter_bank, apply_filter, apply_filter_bank, apply_filter_parallel, PARALLEL_SEGMENT_SIZE
 )
 from logic_signal_transformations import *
+from logic_signal_compression import (
+    COMPRESSION_BLOCK_SIZE, RICE, checksum_blocks, compress_blocks, decompress_blocks
+)
+from logic_signal_import import import_metadata, import_signal, is_importable
+from logic_decimation import decimate
+from logic_signal_cache import SignalCache
+
+
+# Number of samples per block used by the streaming reader
+DEFAULT_BLOCK_SIZE = 65536
+
+# Version-2 container: magic, format version, reserved word and header length,
+# followed by a JSON header padded with spaces so that the payload starts on a
+# PAYLOAD_ALIGNMENT boundary. Version-1 files start directly with a native
+# uint32 header length and are still read transparently.
+SIGNAL_FILE_MAGIC = b'CYFR'
+SIGNAL_FILE_VERSION = 2
+PAYLOAD_ALIGNMENT = 64
+_PREAMBLE = struct.Struct('<4sHHI')
+
+# Sample types of the version-2 container, always stored little-endian
+SAMPLE_DTYPES = {
+    'uint8': np.dtype('u1'),
+    'uint16': np.dtype('<u2'),
+    'int16': np.dtype('<i2'),
+    'int32': np.dtype('<i4'),
+    'float32': np.dtype('<f4'),
+    'float64': np.dtype('<f8'),
+    'complex64': np.dtype('<c8'),
+    'complex128': np.dtype('<c16'),
+}
+
+# Spare header bytes left in uncompressed version-2 files, so num_samples and
+# duration can grow in place when samples are appended
+HEADER_RESERVE = 128
+
+# Shared by every load_signal call; resize with signal_cache.resize(max_bytes)
+signal_cache = SignalCache()
 
 
 class SignalFileHandler:
     @staticmethod
     def save_signal(filename, signal_data, metadata: dict = None, start_time=0, sampling_freq=1, is_complex=False,
-                    duration=None):
+                    duration=None, dtype=None, version=SIGNAL_FILE_VERSION, compression=None,
+                    block_size=COMPRESSION_BLOCK_SIZE, append=False, checksum=False):
+        """
+        Save a signal file.
+
+        dtype selects the stored sample type (a key of SAMPLE_DTYPES); None keeps
+        float64/complex128 and 'auto' picks the most compact type that stores the
+        samples losslessly. version=1 writes the legacy float64/complex128 format.
+
+        compression ('zlib' or 'lzma') stores the payload as independently
+        compressed, byte-shuffled blocks of block_size samples, with their offsets
+        in the header so any range can be read without decompressing the rest.
+        compression='rice' is a lossless predictive codec for outputs of quantize():
+        it stores Rice-coded level codes and needs 'min_value' and 'step_size' in
+        metadata.
+
+        A QuantizedSignal (quantize(..., codes=True)) is stored as its level codes,
+        with the quantization descriptor in the header; loading dequantizes it.
+
+        checksum=True stores a CRC32 of every block of block_size samples (of
+        every compressed block) in the header, which verify() checks.
+
+        With append=True the samples are added to the end of an existing
+        uncompressed version-2 file, in its stored sample type, and only
+        num_samples and duration are patched into its header; the other
+        arguments only apply when the file does not exist yet.
+        """
+        if append and os.path.exists(filename):
+            SignalFileHandler._append_samples(filename, signal_data)
+            return
+
         # If metadata is provided, use its values and override the arguments
         if metadata is not None:
             start_time = metadata.get('start_time', start_time)
             sampling_freq = metadata.get('sampling_freq', sampling_freq)
             is_complex = metadata.get('is_complex', is_complex)
-            num_samples = metadata.get('num_samples', len(signal_data))
+            num_samples = len(signal_data)
             duration = metadata.get('duration', duration if duration is not None else num_samples / sampling_freq)
         else:
             num_samples = len(signal_data)
@@ -27,8 +100,13 @@ class SignalFileHandler:
 
         print("Saving signal, metadata")
         print(metadata)
-        # Build metadata
+        # Build metadata, keeping any extra entries (e.g. quantization parameters)
+        extra_metadata = {}
+        if metadata is not None:
+            extra_metadata = {key: value.item() if isinstance(value, np.generic) else value
+                              for key, value in metadata.items()}
         metadata = {
+            **extra_metadata,
             'start_time': start_time,
             'sampling_freq': sampling_freq,
             'is_complex': is_complex,
@@ -36,69 +114,485 @@ class SignalFileHandler:
             'duration': duration
         }
 
-        # Write to file
-        with open(filename, 'wb') as f:
+        if version == 1:
+            if dtype is not None or compression is not None or checksum:
+                raise ValueError("Version 1 signal files only store uncompressed float64/complex128 samples.")
+            # Complex samples are stored as interleaved (real, imaginary) doubles,
+            # which is exactly the memory layout of complex128
+            samples = np.ascontiguousarray(signal_data, dtype=np.complex128 if is_complex else np.float64)
+            payload = [samples]
+            header = SignalFileHandler._build_header(metadata)
+        elif version == SIGNAL_FILE_VERSION:
+            if isinstance(signal_data, QuantizedSignal):
+                samples = np.asarray(signal_data.codes,
+                                     dtype=quantization_code_dtype(signal_data.descriptor['num_levels']))
+                layout = {'dtype': samples.dtype.name, 'quantization': signal_data.descriptor}
+            else:
+                dtype_name = SignalFileHandler._select_dtype(signal_data, is_complex, dtype)
+                samples = np.ascontiguousarray(signal_data, dtype=SAMPLE_DTYPES[dtype_name])
+                layout = {'dtype': dtype_name}
+            if compression is None:
+                payload = [samples]
+                reserve = HEADER_RESERVE
+            else:
+                reserve = 0
+                quantization = None
+                if compression == RICE:
+                    if samples.dtype != np.float64 or 'min_value' not in metadata or 'step_size' not in metadata:
+                        raise ValueError("The rice codec stores float64 outputs of quantize() only.")
+                    quantization = {'min_value': float(metadata['min_value']),
+                                    'step_size': float(metadata['step_size'])}
+                    layout.update(quantization)
+                payload = compress_blocks(samples, compression, block_size, quantization=quantization)
+                layout.update(compression=compression, block_size=block_size, shuffle=compression != RICE,
+                              block_offsets=[0] + np.cumsum([len(chunk) for chunk in payload], dtype=np.int64).tolist())
+            if checksum:
+                if compression is None:
+                    raw = samples.view(np.uint8)
+                    step = block_size * samples.dtype.itemsize
+                    blocks = [raw[start:start + step] for start in range(0, len(raw), step)]
+                    layout['checksum_block_size'] = block_size
+                else:
+                    blocks = payload
+                layout.update(checksum='crc32', checksums=checksum_blocks(blocks))
+            header = SignalFileHandler._build_header(metadata, layout, reserve=reserve)
+        else:
+            raise ValueError(f"Unsupported signal file version: {version}")
+
+        # Write to a temporary file and swap it in, so memory-mapped views of the
+        # previous contents (see load_signal(mmap=True)) stay valid
+        temp_filename = filename + '.tmp'
+        with open(temp_filename, 'wb') as f:
+            f.write(header)
+            for chunk in payload:
+                f.write(chunk)
+        os.replace(temp_filename, filename)
+        signal_cache.invalidate(filename)
+
+    @staticmethod
+    def _append_samples(filename, signal_data):
+        """
+        Append samples to an uncompressed version-2 file in place. The samples
+        are written and flushed before the header is patched, so an interrupted
+        append leaves the file with its previous, consistent header (readers
+        ignore surplus payload bytes).
+        """
+        with open(filename, 'r+b') as f:
+            metadata, layout = SignalFileHandler._read_header(f)
+            if (layout['version'] != SIGNAL_FILE_VERSION or 'compression' in layout or 'checksums' in layout
+                    or 'quantization' in layout):
+                raise ValueError("Samples can only be appended to uncompressed, unquantized version-2 signal "
+                                 "files without checksums.")
+
+            dtype = layout['dtype']
+            samples = np.asarray(signal_data)
+            if np.iscomplexobj(samples) and dtype.kind != 'c':
+                raise ValueError("Complex samples cannot be appended to a real signal file.")
+            stored = np.ascontiguousarray(samples, dtype=dtype)
+            if dtype.kind in 'iu' and not np.array_equal(stored, samples):
+                raise ValueError(f"Samples cannot be stored exactly as {layout['dtype'].name}.")
+
+            num_samples = layout['num_samples'] + len(stored)
+            metadata['num_samples'] = num_samples
+            metadata['duration'] = num_samples / metadata['sampling_freq']
+            file_layout = {key: value for key, value in layout.items()
+                           if key not in ('version', 'dtype', 'num_samples', 'payload_offset')}
+            file_layout['dtype'] = next(name for name, value in SAMPLE_DTYPES.items() if value == dtype)
+            # Built first, so a header that no longer fits fails before anything is written
+            header = SignalFileHandler._build_header(metadata, file_layout, size=layout['payload_offset'])
+
+            # Write after the last recorded sample, overwriting any tail left by an interrupted append
+            f.seek(layout['payload_offset'] + layout['num_samples'] * dtype.itemsize)
+            stored.tofile(f)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+
+            f.seek(0)
+            f.write(header)
+        signal_cache.invalidate(filename)
+
+    @staticmethod
+    def _select_dtype(signal_data, is_complex, dtype=None):
+        """Resolve the dtype argument of save_signal to a SAMPLE_DTYPES key."""
+        if dtype is None:
+            return 'complex128' if is_complex else 'float64'
+        if dtype != 'auto':
+            if dtype not in SAMPLE_DTYPES:
+                raise ValueError(f"Unsupported sample type: {dtype}")
+            if SAMPLE_DTYPES[dtype].kind != 'c' and is_complex:
+                raise ValueError(f"Complex signals cannot be stored as {dtype}.")
+            return dtype
+
+        signal_data = np.asarray(signal_data)
+        if is_complex:
+            candidates = ['complex64', 'complex128']
+        elif np.issubdtype(signal_data.dtype, np.integer):
+            candidates = ['int16', 'int32', 'float64']
+        else:
+            candidates = ['int16', 'int32', 'float32', 'float64']
+
+        # Take the first (smallest) type that round-trips every sample exactly
+        for name in candidates[:-1]:
+            target = SAMPLE_DTYPES[name]
+            if target.kind == 'i':
+                info = np.iinfo(target)
+                if len(signal_data) and not (np.all(np.isfinite(signal_data)) and
+                                             info.min <= np.min(signal_data) and np.max(signal_data) <= info.max):
+                    continue
+            if np.array_equal(signal_data.astype(target), signal_data, equal_nan=target.kind != 'i'):
+                return name
+        return candidates[-1]
+
+    @staticmethod
+    def _build_header(metadata, layout=None, reserve=0, size=None):
+        """
+        Encode the file header. Without a layout the version-1 header is built,
+        otherwise a version-2 header whose 'format' entry holds the layout.
+
+        The JSON is padded with spaces (which JSON ignores) to leave at least
+        `reserve` spare bytes, or to exactly `size` bytes when rewriting a header
+        in place.
+        """
+        if layout is None:
             metadata_json = json.dumps(metadata).encode('utf-8')
-            f.write(struct.pack('I', len(metadata_json)))
-            f.write(metadata_json)
+            prefix_size = 4
+        else:
+            metadata_json = json.dumps(dict(metadata, format=layout)).encode('utf-8')
+            prefix_size = _PREAMBLE.size
 
-            if is_complex:
-                # Write complex signal (real and imaginary parts)
-                for value in signal_data:
-                    f.write(struct.pack('dd', value.real, value.imag))
-            else:
-                # Write real signal
-                for value in signal_data:
-                    f.write(struct.pack('d', value))  # Double precision float
+        if size is None:
+            size = prefix_size + len(metadata_json) + reserve
+            if layout is not None:
+                size += -size % PAYLOAD_ALIGNMENT
+        elif prefix_size + len(metadata_json) > size:
+            raise ValueError("Signal header does not fit in the reserved space.")
+        metadata_json = metadata_json.ljust(size - prefix_size)
+
+        if layout is None:
+            return struct.pack('I', len(metadata_json)) + metadata_json
+        return _PREAMBLE.pack(SIGNAL_FILE_MAGIC, SIGNAL_FILE_VERSION, 0, len(metadata_json)) + metadata_json
+
+    @staticmethod
+    def _read_header(f, check_size=True):
+        """
+        Read the header of an open signal file of either version.
+
+        Returns (metadata, layout) and leaves f positioned at the start of the
+        payload. layout holds the 'format' entry of a version-2 header together
+        with the file 'version', the sample 'dtype', 'num_samples' and the
+        'payload_offset'. Raises ValueError if the payload is shorter than the
+        number of samples recorded in the header, unless check_size is False.
+        """
+        prefix = f.read(4)
+        if prefix == SIGNAL_FILE_MAGIC:
+            _, version, _, header_len = _PREAMBLE.unpack(prefix + f.read(_PREAMBLE.size - 4))
+            if version > SIGNAL_FILE_VERSION:
+                raise ValueError(f"Unsupported signal file version: {version}")
+            metadata = json.loads(f.read(header_len).decode('utf-8'))
+            layout = metadata.pop('format')
+            dtype = SAMPLE_DTYPES[layout['dtype']]
+        else:
+            # Version 1: native uint32 metadata length, JSON metadata, native doubles
+            metadata_len = struct.unpack('I', prefix)[0]
+            metadata = json.loads(f.read(metadata_len).decode('utf-8'))
+            version = 1
+            layout = {}
+            dtype = np.dtype(np.complex128 if metadata['is_complex'] else np.float64)
+
+        payload_offset = f.tell()
+        payload_size = os.fstat(f.fileno()).st_size - payload_offset
+        if 'compression' in layout:
+            num_samples = metadata['num_samples']
+            num_blocks = -(-num_samples // layout['block_size'])
+            if len(layout['block_offsets']) != num_blocks + 1:
+                raise ValueError(f"Signal file block table lists {len(layout['block_offsets']) - 1} blocks, "
+                                 f"{num_samples} samples need {num_blocks}.")
+            if check_size and payload_size < layout['block_offsets'][-1]:
+                raise ValueError(f"Signal file is truncated: compressed payload needs "
+                                 f"{layout['block_offsets'][-1]} bytes, file holds {payload_size}.")
+        else:
+            available_samples = payload_size // dtype.itemsize
+            num_samples = metadata.get('num_samples', available_samples)
+            if check_size and available_samples < num_samples:
+                raise ValueError(f"Signal file is truncated: header declares {num_samples} samples, "
+                                 f"payload holds {available_samples}.")
+
+        layout.update(version=version, dtype=dtype, num_samples=num_samples, payload_offset=payload_offset)
+        return metadata, layout
+
+    @staticmethod
+    def _to_values(samples, layout=None):
+        """
+        Convert stored samples to the float64/complex128 values the processing
+        code works on. Level codes of a quantized file are looked up in the
+        levels of its descriptor.
+        """
+        if layout is not None and 'quantization' in layout:
+            return QuantizedSignal(samples, layout['quantization']).dequantize()
+        return samples.astype(np.complex128 if samples.dtype.kind == 'c' else np.float64, copy=False)
+
+    @staticmethod
+    def _read_samples(f, layout, start, stop):
+        """
+        Read stored samples [start, stop) of an open signal file. Compressed files
+        only decompress the blocks overlapping the range, in parallel.
+        """
+        dtype = layout['dtype']
+        stop = min(stop, layout['num_samples'])
+        if 'compression' not in layout:
+            f.seek(layout['payload_offset'] + start * dtype.itemsize)
+            return np.fromfile(f, dtype=dtype, count=stop - start)
+        if stop <= start:
+            return np.empty(0, dtype=dtype)
+
+        block_size = layout['block_size']
+        offsets = layout['block_offsets']
+        first_block = start // block_size
+        last_block = (stop - 1) // block_size
 
+        # The overlapping blocks are contiguous on disk, so read them in one go
+        f.seek(layout['payload_offset'] + offsets[first_block])
+        data = f.read(offsets[last_block + 1] - offsets[first_block])
+        chunks = [data[offsets[i] - offsets[first_block]:offsets[i + 1] - offsets[first_block]]
+                  for i in range(first_block, last_block + 1)]
+
+        block_start = first_block * block_size
+        block_stop = min((last_block + 1) * block_size, layout['num_samples'])
+        quantization = None
+        if layout['compression'] == RICE:
+            quantization = {'min_value': layout['min_value'], 'step_size': layout['step_size']}
+        samples = decompress_blocks(chunks, np.empty(block_stop - block_start, dtype=dtype),
+                                    layout['compression'], block_size, layout['shuffle'],
+                                    quantization=quantization)
+        return samples[start - block_start:stop - block_start]
+
+    @staticmethod
+    def read_metadata(filename):
+        """
+        Read only the metadata header of a signal file.
+
+        The payload is never read, so the cost does not depend on the file size.
+        Importable files (see logic_signal_import) are also accepted: .npy and
+        WAV files only have their headers parsed, while .npz and .csv files
+        have to be decoded, which is cached for the load that usually follows.
+        """
+        if os.path.splitext(filename)[1].lower() in ('.npz', '.csv'):
+            return SignalFileHandler.load_signal(filename, mmap=True)[0]
+        if is_importable(filename):
+            return import_metadata(filename)
+        with open(filename, 'rb') as f:
+            metadata, _ = SignalFileHandler._read_header(f)
+            return metadata
+
+    @staticmethod
+    def load_signal(filename, mmap=False, use_cache=True):
+        """
+        Load a signal file and return (metadata, signal_data).
+
+        This is the one loader for every signal file. Results go through the
+        process-wide signal_cache, so opening the same unchanged file again
+        (e.g. in another dialog) does not decode it again; cached arrays are
+        read-only. An in-memory copy also satisfies mmap=True requests.
+
+        Samples are returned as float64/complex128 whatever the stored type. With
+        mmap=True the payload is not read; signal_data is a read-only np.memmap
+        over the file in the stored floating-point type, so only the pages that
+        are accessed get loaded. Integer payloads (and the level codes of
+        quantized files) are still widened to float64, since the signal
+        operations assume floating-point samples, and compressed payloads cannot
+        be mapped, so they are decompressed as usual.
+
+        .npy, .npz, .wav and .csv files are imported with import_signal().
+        """
+        if not use_cache:
+            return SignalFileHandler._decode_signal(filename, mmap)
+
+        # The last key element tells whether the cached array is a memory map
+        file_key = SignalCache.file_key(filename)
+        keys = [file_key + (True,), file_key + (False,)] if mmap else [file_key + (False,)]
+        cached = signal_cache.get(*keys)
+        if cached is not None:
+            return cached
+
+        metadata, signal_data = SignalFileHandler._decode_signal(filename, mmap)
+        signal_cache.put(file_key + (isinstance(signal_data, np.memmap),), metadata, signal_data)
+        return metadata, signal_data
 
     @staticmethod
-    def load_signal(filename):
+    def _decode_signal(filename, mmap):
+        if is_importable(filename):
+            metadata, signal_data = import_signal(filename)
+            if not mmap:
+                dtype = np.complex128 if np.iscomplexobj(signal_data) else np.float64
+                signal_data = np.array(signal_data, dtype=dtype)
+            return metadata, signal_data
+
         with open(filename, 'rb') as f:
-            # Read and unpack the metadata length
-            metadata_len = struct.unpack('I', f.read(4))[0]
-
-            # Read and decode metadata
-            metadata_json = f.read(metadata_len).decode('utf-8')
-            metadata = json.loads(metadata_json)
-
-            # Load the signal data based on whether it is complex or real
-            signal_data = []
-            if metadata['is_complex']:
-                # Load complex signal (pairs of floats: real and imaginary parts)
-                while True:
-                    value_bytes = f.read(16)  # 16 bytes for two doubles (real + imaginary)
-                    if not value_bytes:
-                        break
-                    real, imag = struct.unpack('dd', value_bytes)
-                    signal_data.append(complex(real, imag))  # Create a complex number
+            metadata, layout = SignalFileHandler._read_header(f)
+            dtype = layout['dtype']
+            num_samples = layout['num_samples']
+
+            if mmap and 'compression' not in layout:
+                if num_samples == 0:
+                    # np.memmap cannot map an empty region
+                    return metadata, SignalFileHandler._to_values(np.empty(0, dtype=dtype), layout)
+                signal_data = np.memmap(f, dtype=dtype, mode='r', offset=layout['payload_offset'],
+                                        shape=(num_samples,))
+                if dtype.kind in 'iu':
+                    signal_data = SignalFileHandler._to_values(signal_data, layout)
             else:
-                # Load real signal (single double precision float)
-                while True:
-                    value_bytes = f.read(8)  # 8 bytes for one double
-                    if not value_bytes:
-                        break
-                    signal_data.append(struct.unpack('d', value_bytes)[0])
+                # Read the whole payload in a single call instead of sample by sample
+                signal_data = SignalFileHandler._to_values(SignalFileHandler._read_samples(f, layout, 0, num_samples),
+                                                           layout)
 
             # Return both metadata (including duration) and signal data
-            return metadata, np.array(signal_data)
+            return metadata, signal_data
 
     @staticmethod
-    def text_representation(filename):
-        metadata, signal_data = SignalFileHandler.load_signal(filename)
+    def load_signal_range(filename, start_time, end_time):
+        """
+        Load only the samples with start_time <= t < end_time and return
+        (metadata, signal_data), with the metadata describing that range.
+        For compressed files only the blocks overlapping the range are read.
+        """
+        imported = None
+        with open(filename, 'rb') as f:
+            if is_importable(filename):
+                metadata, imported = import_signal(filename)
+                layout = {'num_samples': len(imported)}
+            else:
+                metadata, layout = SignalFileHandler._read_header(f)
+            sampling_freq = metadata['sampling_freq']
+            start = int(np.ceil((start_time - metadata['start_time']) * sampling_freq))
+            stop = int(np.ceil((end_time - metadata['start_time']) * sampling_freq))
+            start = min(max(start, 0), layout['num_samples'])
+            stop = min(max(stop, start), layout['num_samples'])
+
+            if imported is not None:
+                signal_data = SignalFileHandler._to_values(np.array(imported[start:stop]))
+            else:
+                signal_data = SignalFileHandler._to_values(SignalFileHandler._read_samples(f, layout, start, stop),
+                                                           layout)
+
+        range_metadata = metadata.copy()
+        range_metadata['start_time'] = metadata['start_time'] + start / sampling_freq
+        range_metadata['num_samples'] = stop - start
+        range_metadata['duration'] = (stop - start) / sampling_freq
+        return range_metadata, signal_data
+
+    @staticmethod
+    def verify(filename, start_block=0, num_blocks=None, max_workers=None):
+        """
+        Check the block checksums of a file saved with checksum=True, reading
+        the blocks in parallel. Blocks missing from a truncated file count as
+        corrupted. Returns a report with the 'corrupted_blocks', the time ranges
+        they cover ('corrupted_ranges', as (start_time, end_time) pairs) and
+        'next_block'. A large file can be checked in several runs by passing
+        num_blocks and resuming from the previous report's 'next_block'.
+        """
+        with open(filename, 'rb') as f:
+            metadata, layout = SignalFileHandler._read_header(f, check_size=False)
+        if 'checksums' not in layout:
+            raise ValueError("Signal file has no checksums; save it with checksum=True.")
+
+        checksums = layout['checksums']
+        num_samples = layout['num_samples']
+        if 'compression' in layout:
+            block_size = layout['block_size']
+            byte_offsets = layout['block_offsets']
+        else:
+            block_size = layout['checksum_block_size']
+            itemsize = layout['dtype'].itemsize
+            byte_offsets = [min(index * block_size, num_samples) * itemsize for index in range(len(checksums) + 1)]
+        payload_offset = layout['payload_offset']
+        stop_block = len(checksums) if num_blocks is None else min(len(checksums), start_block + num_blocks)
 
-        text_repr = "Signal Metadata:\n"
-        for key, value in metadata.items():
-            text_repr += f"{key}: {value}\n"
+        def check_blocks(indices):
+            corrupted = []
+            with open(filename, 'rb') as f:
+                for index in indices.tolist():
+                    size = byte_offsets[index + 1] - byte_offsets[index]
+                    f.seek(payload_offset + byte_offsets[index])
+                    data = f.read(size)
+                    if len(data) < size or zlib.crc32(data) != checksums[index]:
+                        corrupted.append(index)
+            return corrupted
 
-        text_repr += "\nSignal Data:\n"
-        for i, value in enumerate(signal_data):
-            if isinstance(value, complex):
-                text_repr += f"Sample {i}: Real={value.real}, Imaginary={value.imag}\n"
+        # Every worker reads its own contiguous stripe of blocks through its own file object
+        max_workers = max_workers or os.cpu_count()
+        stripes = np.array_split(np.arange(start_block, stop_block), max_workers * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            corrupted = [index for found in executor.map(check_blocks, stripes) for index in found]
+
+        # Merge runs of consecutive corrupted blocks into time ranges
+        runs = []
+        for index in corrupted:
+            if runs and runs[-1][1] == index:
+                runs[-1][1] = index + 1
             else:
-                text_repr += f"Sample {i}: {value}\n"
+                runs.append([index, index + 1])
+        sampling_freq, start_time = metadata['sampling_freq'], metadata['start_time']
+        ranges = [(start_time + first * block_size / sampling_freq,
+                   start_time + min(last * block_size, num_samples) / sampling_freq) for first, last in runs]
+
+        return {
+            'num_blocks': len(checksums),
+            'next_block': stop_block,
+            'corrupted_blocks': corrupted,
+            'corrupted_ranges': ranges
+        }
+
+    @staticmethod
+    def text_representation(filename):
+        metadata, signal_data = SignalFileHandler.load_signal(filename, mmap=True)
+        text_repr = io.StringIO()
+        SignalFileHandler.export_text(text_repr, signal_data, metadata)
+        return text_repr.getvalue()
+
+    @staticmethod
+    def export_text(output, signal_data, metadata, csv=False, chunk_size=DEFAULT_BLOCK_SIZE):
+        """
+        Write a text representation of a signal to output (a file name or an open
+        text file), formatting chunk_size samples at a time so memory stays bounded.
+        signal_data can be an in-memory array or a memory-mapped view.
+
+        The default format lists the metadata followed by one "Sample i: value"
+        line per sample. With csv=True a "time,value" (or "time,real,imag") table
+        is written instead.
+        """
+        if isinstance(output, (str, os.PathLike)):
+            with open(output, 'w') as f:
+                SignalFileHandler.export_text(f, signal_data, metadata, csv, chunk_size)
+            return
+
+        is_complex = np.iscomplexobj(signal_data)
+        if csv:
+            output.write("time,real,imag\n" if is_complex else "time,value\n")
+            start_time = metadata.get('start_time', 0)
+            sampling_period = 1 / metadata.get('sampling_freq', 1)
+        else:
+            output.write("Signal Metadata:\n")
+            for key, value in metadata.items():
+                output.write(f"{key}: {value}\n")
+            output.write("\nSignal Data:\n")
 
-        return text_repr
+        for start in range(0, len(signal_data), chunk_size):
+            chunk = signal_data[start:start + chunk_size]
+            if csv:
+                times = (start_time + np.arange(start, start + len(chunk)) * sampling_period).tolist()
+                if is_complex:
+                    lines = map("{},{},{}\n".format, times, chunk.real.tolist(), chunk.imag.tolist())
+                else:
+                    lines = map("{},{}\n".format, times, chunk.tolist())
+            else:
+                indices = range(start, start + len(chunk))
+                if is_complex:
+                    lines = map("Sample {}: Real={}, Imaginary={}\n".format,
+                                indices, chunk.real.tolist(), chunk.imag.tolist())
+                else:
+                    lines = map("Sample {}: {}\n".format, indices, chunk.tolist())
+            output.write(''.join(lines))
 
     @staticmethod
     def perform_signal_operation(signal1, signal2, operation):
@@ -121,7 +615,8 @@ class SignalFileHandler:
             raise ValueError(f"Unsupported operation: {operation}")
 
     @staticmethod
-    def perform_signal_conversion(signal, metadata, operation, frequency = None, quantization_lvl = None):
+    def perform_signal_conversion(signal, metadata, operation, frequency = None, quantization_lvl = None,
+                                  edge_mode='periodic'):
         if operation == SAMPLING:
             downsampled_signal, downsampled_metadata = sample(signal, metadata, frequency)
             return downsampled_signal, downsampled_metadata
@@ -134,13 +629,32 @@ class SignalFileHandler:
             return interpolate(signal, metadata, frequency)  # Implement the first-order interpolation
         elif operation == RECONSTRUCTION:
             return reconstruct(signal, metadata, frequency)  # Implement sinc-based reconstruction
+        elif operation == FFT_RESAMPLING:
+            return fft_resample(signal, metadata, frequency, edge_mode)  # Spectrum zero-padding/truncation
+        elif operation == DECIMATION:
+            return decimate(signal, metadata, frequency)  # Multi-stage CIC/half-band/FIR decimation
+        elif operation == CUBIC_INTERPOLATION:
+            return cubic_interpolate(signal, metadata, frequency)
+        elif operation == LAGRANGE_INTERPOLATION:
+            return lagrange_interpolate(signal, metadata, frequency)
+        elif operation == FARROW_INTERPOLATION:
+            return farrow_interpolate(signal, metadata, frequency)
 
         else:
             raise ValueError(f"Unsupported operation: {operation}")
 
     @staticmethod
     def perform_signal_filtering(signal, metadata, operation,
-                                 filtering_frequency=None, num_of_taps=None, is_hanning_window=False):
+                                 filtering_frequency=None, num_of_taps=None, is_hanning_window=False,
+                                 window_type=None, max_workers=None, second_filtering_frequency=None):
+        """
+        Low-, high-, band-pass or band-stop filter the signal; the band filters
+        take the band between filtering_frequency and second_filtering_frequency.
+        window_type is one of
+        filtering.WINDOW_TYPES; without it is_hanning_window picks between the
+        Hann and the rectangular window. Long signals are filtered in parallel
+        segments on max_workers threads (default: one per CPU).
+        """
         if filtering_frequency is None or num_of_taps is None:
             raise ValueError("Filtering frequency and number of taps must be provided.")
 
@@ -155,28 +669,62 @@ class SignalFileHandler:
             raise ValueError("Cutoff frequency must be between 0 and Nyquist frequency.")
 
         # Window type
-        if is_hanning_window:
-            window_type = 'hann'
-        else:
-            window_type = 'boxcar'
+        if window_type is None:
+            window_type = 'hann' if is_hanning_window else 'boxcar'
 
+        K = np.floor(sampling_freq / filtering_frequency)
         if operation == LOW_PASS_FILTER:
-            filter_function = design_lowpass_filter
+            filter_coeffs = design_lowpass_filter(num_of_taps, K, window_type)
         elif operation == HIGH_PASS_FILTER:
-            filter_function = design_highpass_filter
+            filter_coeffs = design_highpass_filter(num_of_taps, K, window_type)
+        elif operation in (BAND_PASS_FILTER, BAND_STOP_FILTER):
+            if second_filtering_frequency is None:
+                raise ValueError("Band filters need the second cutoff frequency.")
+            if not (filtering_frequency < second_filtering_frequency < nyquist):
+                raise ValueError("The second cutoff frequency must be between the first one and Nyquist frequency.")
+            # Unrounded K for both edges, so that close edges stay distinct and exact
+            filter_function = design_bandpass_filter if operation == BAND_PASS_FILTER else design_bandstop_filter
+            filter_coeffs = filter_function(num_of_taps, sampling_freq / filtering_frequency,
+                                            sampling_freq / second_filtering_frequency, window_type)
         else:
             raise ValueError(f"Unsupported operation: {operation}")
 
-        K = np.floor(sampling_freq / filtering_frequency)
-        filtered_signal = apply_filter(signal, filter_function(num_of_taps, K, window_type))
+        if len(signal) > PARALLEL_SEGMENT_SIZE:
+            filtered_signal = apply_filter_parallel(signal, filter_coeffs, max_workers=max_workers)
+        else:
+            filtered_signal = apply_filter(signal, filter_coeffs)
 
         new_metadata = metadata.copy()
         new_metadata["filtering_frequency"] = filtering_frequency
+        if operation in (BAND_PASS_FILTER, BAND_STOP_FILTER):
+            new_metadata["second_filtering_frequency"] = second_filtering_frequency
         new_metadata["num_of_taps"] = num_of_taps
-        new_metadata["is_hanning_window"] = is_hanning_window
+        new_metadata["is_hanning_window"] = window_type == 'hann'
+        new_metadata["window_type"] = window_type
 
         return filtered_signal, new_metadata
 
+    @staticmethod
+    def perform_filter_bank(signal, metadata, band_edges, num_of_taps, window_type='hann', method='auto'):
+        """
+        Split the signal into the bands between consecutive band_edges (Hz) in
+        one pass with apply_filter_bank(). Returns (bands, metadata), bands
+        holding one row of samples per band.
+        """
+        sampling_freq = metadata.get("sampling_freq")
+        if sampling_freq is None:
+            raise ValueError("Sampling frequency is missing in metadata.")
+
+        bank = design_filter_bank(num_of_taps, band_edges, sampling_freq, window_type)
+        bands = apply_filter_bank(signal, bank, method=method)
+
+        new_metadata = metadata.copy()
+        new_metadata["band_edges"] = [float(edge) for edge in band_edges]
+        new_metadata["num_bands"] = len(bank)
+        new_metadata["num_of_taps"] = num_of_taps
+        new_metadata["window_type"] = window_type
+        return bands, new_metadata
+
 
     def perform_convolution(signal1, signal2, metadata1=None, metadata2=None):
         """
@@ -277,3 +825,210 @@ class SignalFileHandler:
             return perform_wavelet_transform(signal, metadata, "db8")
         else:
             raise ValueError(f"Unsupported transformation operation: {operation}")
+
+
+def iter_blocks(filename, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Yield the samples of a signal file as consecutive float64/complex128 arrays
+    of at most block_size samples, so files larger than RAM can be processed.
+    Use SignalFileHandler.read_metadata for the header.
+    """
+    if is_importable(filename):
+        _, signal_data = import_signal(filename)
+        for start in range(0, len(signal_data), block_size):
+            yield SignalFileHandler._to_values(np.array(signal_data[start:start + block_size]))
+        return
+
+    with open(filename, 'rb') as f:
+        _, layout = SignalFileHandler._read_header(f)
+        if 'compression' in layout:
+            # Decompress one stored block at a time and cut it to the requested size
+            stored = (SignalFileHandler._read_samples(f, layout, start, start + layout['block_size'])
+                      for start in range(0, layout['num_samples'], layout['block_size']))
+            for block in _rechunk(stored, block_size):
+                yield SignalFileHandler._to_values(block, layout)
+            return
+
+        remaining = layout['num_samples']
+        while remaining > 0:
+            count = min(block_size, remaining)
+            yield SignalFileHandler._to_values(np.fromfile(f, dtype=layout['dtype'], count=count), layout)
+            remaining -= count
+
+
+def _rechunk(blocks, block_size):
+    """Regroup a sequence of arrays into consecutive arrays of block_size samples (the last may be shorter)."""
+    pending = []
+    pending_size = 0
+    for block in blocks:
+        pending.append(block)
+        pending_size += len(block)
+        if pending_size >= block_size:
+            merged = np.concatenate(pending)
+            full = len(merged) - len(merged) % block_size
+            for start in range(0, full, block_size):
+                yield merged[start:start + block_size]
+            pending = [merged[full:]]
+            pending_size = len(pending[0])
+    if pending_size:
+        yield np.concatenate(pending)
+
+
+class SignalWriter:
+    """
+    Write a version-2 signal file block by block:
+
+        with SignalWriter(filename, sampling_freq=fs) as writer:
+            for block in blocks:
+                writer.write(block)
+
+    The header is written up front with spare room, and num_samples and
+    duration (and any entries changed in self.metadata) are patched into it on
+    close. dtype is a key of SAMPLE_DTYPES (None keeps float64/complex128).
+    With a quantization descriptor (see QuantizedSignal) the blocks are level
+    codes or QuantizedSignal blocks with that descriptor.
+
+    The file is written next to filename and swapped in on close, like in
+    save_signal, so memory-mapped views of the previous contents stay valid;
+    if the with block raises, the previous file is kept.
+    """
+    def __init__(self, filename, metadata: dict = None, start_time=0, sampling_freq=1, is_complex=False,
+                 dtype=None, quantization=None):
+        extra_metadata = {}
+        if metadata is not None:
+            extra_metadata = {key: value.item() if isinstance(value, np.generic) else value
+                              for key, value in metadata.items()}
+            start_time = metadata.get('start_time', start_time)
+            sampling_freq = metadata.get('sampling_freq', sampling_freq)
+            is_complex = metadata.get('is_complex', is_complex)
+        if dtype == 'auto':
+            raise ValueError("The sample type of a streamed signal has to be given explicitly.")
+
+        self.metadata = {
+            **extra_metadata,
+            'start_time': start_time,
+            'sampling_freq': sampling_freq,
+            'is_complex': is_complex,
+            'num_samples': 0,
+            'duration': 0.0
+        }
+        if quantization is not None:
+            self.layout = {'dtype': quantization_code_dtype(quantization['num_levels']).name,
+                           'quantization': quantization}
+        else:
+            self.layout = {'dtype': SignalFileHandler._select_dtype(None, is_complex, dtype)}
+        self.dtype = SAMPLE_DTYPES[self.layout['dtype']]
+        self.num_samples = 0
+
+        self.filename = filename
+        self.temp_filename = filename + '.tmp'
+        self.file = open(self.temp_filename, 'wb')
+        header = SignalFileHandler._build_header(self.metadata, self.layout, reserve=HEADER_RESERVE)
+        self.header_size = len(header)
+        self.file.write(header)
+
+    def write(self, block):
+        if isinstance(block, QuantizedSignal):
+            block = block.codes
+        block = np.ascontiguousarray(block, dtype=self.dtype)
+        block.tofile(self.file)
+        self.num_samples += len(block)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.metadata['num_samples'] = self.num_samples
+        self.metadata['duration'] = self.num_samples / self.metadata['sampling_freq']
+
+        # Rewrite the header in place, keeping its original size
+        try:
+            header = SignalFileHandler._build_header(self.metadata, self.layout, size=self.header_size)
+            self.file.seek(0)
+            self.file.write(header)
+        except BaseException:
+            self.abort()
+            raise
+        self.file.close()
+        os.replace(self.temp_filename, self.filename)
+        signal_cache.invalidate(self.filename)
+
+    def abort(self):
+        """Discard what was written, leaving any previous file untouched."""
+        if not self.file.closed:
+            self.file.close()
+            os.remove(self.temp_filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def quantize_file(filename, output_filename, num_levels=16, min_value=None, max_value=None,
+                  block_size=DEFAULT_BLOCK_SIZE, **options):
+    """
+    Quantize a signal file into output_filename in a single streaming pass with
+    a StreamingQuantizer; options are its codes, companding, dither, seed and
+    headroom arguments (with codes=True the output stores the level codes).
+    Without an explicit range the 'min_value' / 'max_value' of the file header
+    are used, if present, else the range is estimated from the first block.
+    Returns the metadata of the output, including the saturation counters.
+    The output is only swapped in once the input has been read, so
+    output_filename may be filename itself.
+    """
+    metadata = SignalFileHandler.read_metadata(filename)
+    if min_value is None and max_value is None and 'min_value' in metadata and 'max_value' in metadata:
+        min_value, max_value = metadata['min_value'], metadata['max_value']
+    quantizer = StreamingQuantizer(num_levels, min_value, max_value, **options)
+
+    # The first block fixes an estimated range, which the output header needs
+    blocks = iter_blocks(filename, block_size)
+    first_block = quantizer.process(next(blocks, np.zeros(0)))
+    quantization = quantizer.descriptor if quantizer.codes else None
+    try:
+        # SignalWriter writes a temp file and replaces output_filename on close
+        with SignalWriter(output_filename, quantizer.update_metadata(metadata), quantization=quantization) as writer:
+            writer.write(first_block)
+            for block in blocks:
+                writer.write(quantizer.process(block))
+            writer.metadata = quantizer.update_metadata(writer.metadata)
+            # Release the input before it is replaced
+            blocks.close()
+    finally:
+        blocks.close()
+    return dict(writer.metadata)
+
+
+def filter_file(filename, output_filename, filter_coeffs, max_workers=None, method='auto'):
+    """
+    Filter a signal file into an uncompressed version-2 output_filename with
+    apply_filter_parallel(), aligned like apply_filter(mode='same'). Input and
+    output are memory-mapped, so files larger than RAM are filtered on all
+    cores without copying. Returns the metadata of the output.
+    """
+    metadata, signal_data = SignalFileHandler.load_signal(filename, mmap=True, use_cache=False)
+    filter_coeffs = np.asarray(filter_coeffs)
+    is_complex = bool(np.iscomplexobj(signal_data) or np.iscomplexobj(filter_coeffs))
+    dtype_name = 'complex128' if is_complex else 'float64'
+    metadata = dict(metadata, is_complex=is_complex, num_of_taps=len(filter_coeffs))
+    header = SignalFileHandler._build_header(metadata, {'dtype': dtype_name}, reserve=HEADER_RESERVE)
+
+    # Size the output up front, map it and let the workers write their segments in place
+    temp_filename = output_filename + '.tmp'
+    num_samples = len(signal_data)
+    with open(temp_filename, 'wb') as f:
+        f.write(header)
+        f.truncate(len(header) + num_samples * SAMPLE_DTYPES[dtype_name].itemsize)
+    if num_samples:
+        output = np.memmap(temp_filename, dtype=SAMPLE_DTYPES[dtype_name], mode='r+', offset=len(header),
+                           shape=(num_samples,))
+        apply_filter_parallel(signal_data, filter_coeffs, out=output, max_workers=max_workers, method=method)
+        output.flush()
+        del output
+    os.replace(temp_filename, output_filename)
+    signal_cache.invalidate(output_filename)
+    return metadata
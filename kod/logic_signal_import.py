@@ -0,0 +1,221 @@
+import os
+import struct
+import warnings
+
+import numpy as np
+
+# File types that can be opened directly in place of a .bin signal file
+IMPORT_EXTENSIONS = ('.npy', '.npz', '.wav', '.csv')
+
+# Number of CSV rows parsed per chunk
+CSV_CHUNK_ROWS = 1 << 20
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def is_importable(filename):
+    return os.path.splitext(filename)[1].lower() in IMPORT_EXTENSIONS
+
+
+def import_signal(filename, sampling_freq=None, start_time=0.0, channel=0):
+    """
+    Open a .npy, .npz, .wav or .csv file and return (metadata, signal_data) in
+    the same form as SignalFileHandler.load_signal.
+
+    Floating-point .npy and WAV payloads are memory-mapped without copying;
+    integer payloads are widened to float64 (WAV PCM is scaled to [-1, 1)).
+    Where the file does not carry the sampling frequency or start time,
+    sampling_freq (default 1) and start_time are used. channel selects the
+    column of multi-channel data.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.npy':
+        signal_data, file_freq, file_start = _select_channel(np.load(filename, mmap_mode='r'), channel), None, None
+    elif extension == '.npz':
+        signal_data, file_freq, file_start = _load_npz(filename, channel)
+    elif extension == '.wav':
+        signal_data, file_freq = _load_wav(filename, channel)
+        file_start = None
+    elif extension == '.csv':
+        signal_data, file_freq, file_start = _load_csv(filename)
+    else:
+        raise ValueError(f"Unsupported file type: {extension}")
+
+    if signal_data.dtype.kind in 'iub':
+        signal_data = signal_data.astype(np.float64)
+
+    sampling_freq = file_freq if file_freq is not None else (sampling_freq or 1.0)
+    start_time = file_start if file_start is not None else start_time
+    metadata = {
+        'start_time': start_time,
+        'sampling_freq': sampling_freq,
+        'is_complex': bool(np.iscomplexobj(signal_data)),
+        'num_samples': len(signal_data),
+        'duration': len(signal_data) / sampling_freq
+    }
+    return metadata, signal_data
+
+
+def import_metadata(filename, sampling_freq=None, start_time=0.0):
+    """
+    Metadata of an importable file, as import_signal() would return it. Only
+    the headers of .npy and WAV files are parsed; .npz and .csv files have to
+    be decoded.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in ('.npz', '.csv'):
+        return import_signal(filename, sampling_freq, start_time)[0]
+
+    if extension == '.npy':
+        array = np.load(filename, mmap_mode='r')
+        num_samples, is_complex = len(array), np.iscomplexobj(array)
+    else:
+        with open(filename, 'rb') as f:
+            wav = _read_wav_header(f)
+        num_samples, is_complex = wav['num_frames'], False
+        sampling_freq = wav['sampling_freq']
+
+    sampling_freq = sampling_freq or 1.0
+    return {
+        'start_time': start_time,
+        'sampling_freq': sampling_freq,
+        'is_complex': bool(is_complex),
+        'num_samples': num_samples,
+        'duration': num_samples / sampling_freq
+    }
+
+
+def _select_channel(array, channel):
+    if array.ndim == 1:
+        return array
+    if array.ndim == 2:
+        return array[:, channel]
+    raise ValueError(f"Expected a 1-D or 2-D array, got shape {array.shape}.")
+
+
+def _load_npz(filename, channel):
+    with np.load(filename) as archive:
+        keys = list(archive.keys())
+        data_key = next((key for key in ('signal', 'data') if key in keys), None)
+        if data_key is None:
+            data_key = next(key for key in keys if archive[key].ndim > 0)
+        signal_data = _select_channel(archive[data_key], channel)
+
+        sampling_freq = start_time = None
+        for key in ('sampling_freq', 'fs'):
+            if key in keys:
+                sampling_freq = float(archive[key])
+        if 'start_time' in keys:
+            start_time = float(archive['start_time'])
+    return signal_data, sampling_freq, start_time
+
+
+def _read_wav_header(f):
+    """Walk the RIFF chunks of a WAV file and return its format and the location of the samples."""
+    riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+    if riff != b'RIFF' or wave != b'WAVE':
+        raise ValueError("Not a RIFF/WAVE file.")
+
+    wav = {}
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            raise ValueError("WAV file has no data chunk.")
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+
+        if chunk_id == b'fmt ':
+            fmt = f.read(chunk_size)
+            audio_format, channels, sampling_freq, _, block_align, bits = struct.unpack_from('<HHIIHH', fmt)
+            if audio_format == _WAVE_FORMAT_EXTENSIBLE:
+                # The real format code is the start of the sub-format GUID
+                audio_format = struct.unpack_from('<H', fmt, 24)[0]
+            wav.update(audio_format=audio_format, channels=channels, sampling_freq=float(sampling_freq),
+                       block_align=block_align, bits=bits)
+        elif chunk_id == b'data':
+            if 'channels' not in wav:
+                raise ValueError("WAV data chunk precedes the fmt chunk.")
+            data_size = min(chunk_size, os.fstat(f.fileno()).st_size - f.tell())
+            wav.update(data_offset=f.tell(), num_frames=data_size // wav['block_align'])
+            return wav
+        else:
+            f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+
+def _load_wav(filename, channel):
+    with open(filename, 'rb') as f:
+        wav = _read_wav_header(f)
+
+    audio_format, bits, channels = wav['audio_format'], wav['bits'], wav['channels']
+    num_frames = wav['num_frames']
+    if num_frames == 0:
+        return np.empty(0), wav['sampling_freq']
+
+    if audio_format == _WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        dtype, scale = np.dtype(f'<f{bits // 8}'), None
+    elif audio_format == _WAVE_FORMAT_PCM and bits in (8, 16, 32):
+        dtype, scale = np.dtype('u1' if bits == 8 else f'<i{bits // 8}'), 2.0 ** (bits - 1)
+    elif audio_format == _WAVE_FORMAT_PCM and bits == 24:
+        dtype, scale = np.dtype('u1'), 2.0 ** 23
+    else:
+        raise ValueError(f"Unsupported WAV sample format: format {audio_format}, {bits} bits.")
+
+    frames = np.memmap(filename, dtype=dtype, mode='r', offset=wav['data_offset'],
+                       shape=(num_frames, wav['block_align'] // dtype.itemsize))
+
+    if bits == 24:
+        # Assemble little-endian 3-byte samples into int32, sign-extended via the top byte
+        samples = frames.reshape(num_frames, channels, 3)[:, channel].astype(np.int32)
+        signal_data = (samples[:, 0] | (samples[:, 1] << 8) | (samples[:, 2] << 16)) << 8 >> 8
+        return signal_data / scale, wav['sampling_freq']
+
+    signal_data = frames[:, channel]
+    if scale is None:
+        return signal_data, wav['sampling_freq']
+    if bits == 8:
+        # 8-bit PCM is unsigned with its zero at 128
+        return (signal_data.astype(np.float64) - 128) / scale, wav['sampling_freq']
+    return signal_data / scale, wav['sampling_freq']
+
+
+def _load_csv(filename):
+    """
+    Parse a CSV file in chunks of CSV_CHUNK_ROWS rows. One column holds the
+    samples; with two columns the first is time, with three they are time,
+    real and imaginary part. A non-numeric first line is skipped as a header.
+    """
+    chunks = []
+    with open(filename) as f:
+        first_line = f.readline()
+        try:
+            [float(field) for field in first_line.split(',')]
+            f.seek(0)
+        except ValueError:
+            pass  # header row
+
+        while True:
+            with warnings.catch_warnings():
+                # An exhausted file yields an empty chunk with a warning
+                warnings.simplefilter('ignore', UserWarning)
+                chunk = np.loadtxt(f, delimiter=',', max_rows=CSV_CHUNK_ROWS, ndmin=2)
+            if len(chunk):
+                chunks.append(chunk)
+            if len(chunk) < CSV_CHUNK_ROWS:
+                break
+
+    table = np.concatenate(chunks) if chunks else np.empty((0, 1))
+    columns = table.shape[1]
+    if columns == 1:
+        return table[:, 0], None, None
+    if columns not in (2, 3):
+        raise ValueError(f"Expected 1 to 3 CSV columns, got {columns}.")
+
+    times = table[:, 0]
+    signal_data = table[:, 1] if columns == 2 else table[:, 1] + 1j * table[:, 2]
+    sampling_freq = None
+    if len(times) > 1 and times[-1] != times[0]:
+        # Round away the noise of times printed with limited precision
+        sampling_freq = float(f"{(len(times) - 1) / (times[-1] - times[0]):.12g}")
+    start_time = float(times[0]) if len(times) else None
+    return signal_data, sampling_freq, start_time
@@ -623,24 +623,20 @@ class DSPApplication(QMainWindow):
             QMessageBox.critical(self, "Error", NO_SIGNAL)
             return
         
-        filename, _ = QFileDialog.getSaveFileName(self, "Save Text Representation", "", "Text Files (*.txt)")
+        filename, selected_filter = QFileDialog.getSaveFileName(self, "Save Text Representation", "",
+                                                                "Text Files (*.txt);;CSV Files (*.csv)")
         if filename:
             try:
-                temp_filename = os.path.join(os.path.dirname(filename), 'temp_signal.bin')
-                SignalFileHandler.save_signal(
-                    temp_filename, 
-                    self.current_signal_data,
-                    start_time=self.common_parameter_inputs[START_TIME].value(),
-                    sampling_freq=self.common_parameter_inputs[SAMPLE_RATE].value(),
-                    duration=self.common_parameter_inputs[DURATION].value()
-                )
-                
-                text_repr = SignalFileHandler.text_representation(temp_filename)
-                os.remove(temp_filename)
-                
-                with open(filename, 'w') as f:
-                    f.write(text_repr)
-                
+                metadata = {
+                    'start_time': self.common_parameter_inputs[START_TIME].value(),
+                    'sampling_freq': self.common_parameter_inputs[SAMPLE_RATE].value(),
+                    'is_complex': bool(np.iscomplexobj(self.current_signal_data)),
+                    'num_samples': len(self.current_signal_data),
+                    'duration': self.common_parameter_inputs[DURATION].value()
+                }
+                csv = filename.lower().endswith('.csv') or selected_filter.startswith("CSV")
+                SignalFileHandler.export_text(filename, self.current_signal_data, metadata, csv=csv)
+
                 QMessageBox.information(self, "Success", TEXT_REPRESENTATION_SAVED)
             except Exception as e:
                 QMessageBox.critical(self, "Error", ERROR_SAVING_TEXT.format(str(e)))
@@ -707,9 +703,13 @@ class DSPApplication(QMainWindow):
                 QMessageBox.critical(self, "Error", ERROR_SAVING.format(str(e)))
 
     def load_signal(self):
-        filename, _ = QFileDialog.getOpenFileName(self, "Otwórz plik sygnału", "", "Pliki binarne (*.bin)")
+        filename, _ = QFileDialog.getOpenFileName(self, "Otwórz plik sygnału", "", SIGNAL_FILE_FILTER)
         if filename:
-            metadata, _ = SignalFileHandler.load_signal(filename)
+            try:
+                metadata = SignalFileHandler.read_metadata(filename)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", ERROR_LOADING.format(str(e)))
+                return
             if metadata.get('is_complex', False):
                 QMessageBox.critical(self, "Błąd",
                                      "Wybrany plik zawiera sygnał zespolony. Użyj opcji 'Wczytaj sygnał zespolony'.")
@@ -717,9 +717,13 @@ class DSPApplication(QMainWindow):
                 self.generate_signal_from_file(filename)
 
     def load_complex_signal(self):
-        filename, _ = QFileDialog.getOpenFileName(self, "Otwórz plik sygnału", "", "Pliki binarne (*.bin)")
+        filename, _ = QFileDialog.getOpenFileName(self, "Otwórz plik sygnału", "", SIGNAL_FILE_FILTER)
         if filename:
-            metadata, _ = SignalFileHandler.load_signal(filename)
+            try:
+                metadata = SignalFileHandler.read_metadata(filename)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", ERROR_LOADING.format(str(e)))
+                return
             if not metadata.get('is_complex', False):
                 QMessageBox.critical(self, "Błąd",
                                      "Wybrany plik zawiera sygnał rzeczywisty. Użyj opcji 'Wczytaj sygnał'.")
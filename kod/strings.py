@@ -111,6 +111,14 @@ SAMPLING = 'Probkowanie'
 EXTRAPOLATION = 'Ekstrapolacja'
 INTERPOLATION = 'Interpolacja'
 RECONSTRUCTION = 'Rekonstrukcja'
+FFT_RESAMPLING = 'Resampling FFT'
+DECIMATION = 'Decymacja wielostopniowa'
+CUBIC_INTERPOLATION = 'Interpolacja sześcienna'
+LAGRANGE_INTERPOLATION = 'Interpolacja Lagrange\'a'
+FARROW_INTERPOLATION = 'Interpolacja Farrowa'
+EDGE_MODE = 'Obsługa krawędzi (FFT)'
+EDGE_PERIODIC = 'Okresowa'
+EDGE_PADDED = 'Odbicie lustrzane'
 SAMPLE_FREQ = 'Częstotliwość próbkowania'
 QUANTIZATION_LVL = 'Poziom Kwantyzacji'
 
@@ -130,8 +138,16 @@ FILTER = 'Filtr'
 #FILTER
 LOW_PASS_FILTER = 'Filtr dolnoprzepustowy'
 HIGH_PASS_FILTER ='Filtr górnoprzepustowy'
+BAND_PASS_FILTER = 'Filtr pasmowoprzepustowy'
+BAND_STOP_FILTER = 'Filtr pasmowozaporowy'
 HANNING_WINDOW = 'Okno Hanninga'
+WINDOW_TYPE = 'Okno'
+RECTANGULAR_WINDOW = 'Prostokątne'
+HAMMING_WINDOW = 'Okno Hamminga'
+BLACKMAN_WINDOW = 'Okno Blackmana'
+KAISER_WINDOW = 'Okno Kaisera'
 CUT_OFF_FREQUENCY = 'Częstotliwość odcięcia'
+SECOND_CUT_OFF_FREQUENCY = 'Górna częstotliwość odcięcia (filtry pasmowe)'
 NUM_OF_TAPS = 'Liczba współczynników'
 PERFORM_FILTER = 'Przefiltruj'
 
@@ -151,3 +167,5 @@ CHOOSE_TRANSFORMATION_METHOD = 'Wybierz metode transformacji'
 LOAD_COMPLEX_SIGNAL = 'Wczytaj zespolony sygnał'
 CHOOSE_DIAGRAM_TYPE = 'Synał zespolony - rodzaj wykresu'
 SHOW_COMPLEX_SIGNAL = 'Wyświetl zespolony sygnał'
+
+SIGNAL_FILE_FILTER = "Pliki sygnałów (*.bin *.npy *.npz *.wav *.csv)"
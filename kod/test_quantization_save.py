@@ -0,0 +1,31 @@
+import numpy as np
+
+from logic_signal_compression import RICE, rice_compatible
+from logic_signal_file_handler import SignalFileHandler
+from strings import QUANTIZATION
+
+
+def _quantize_and_save(tmp_path, signal):
+    # Same flow as the conversion dialog: load, quantize, save losslessly when possible
+    source = str(tmp_path / 'source.bin')
+    SignalFileHandler.save_signal(source, signal, sampling_freq=1000, dtype='auto')
+    metadata, loaded = SignalFileHandler.load_signal(source, mmap=True)
+    result, result_metadata = SignalFileHandler.perform_signal_conversion(loaded, metadata, QUANTIZATION,
+                                                                          quantization_lvl=16)
+    compression = RICE if rice_compatible(result, result_metadata) else None
+    target = str(tmp_path / 'quantized.bin')
+    SignalFileHandler.save_signal(target, result, metadata=result_metadata, compression=compression)
+    return result, compression, SignalFileHandler.load_signal(target)[1]
+
+
+def test_float32_signal_is_saved_with_rice(tmp_path):
+    signal = np.sin(np.linspace(0, 20, 5000)).astype(np.float32)
+    result, compression, saved = _quantize_and_save(tmp_path, signal)
+    assert compression == RICE
+    assert np.array_equal(saved, result)
+
+
+def test_constant_signal_falls_back_to_no_compression(tmp_path):
+    result, compression, saved = _quantize_and_save(tmp_path, np.full(1000, 0.5, dtype=np.float32))
+    assert compression is None
+    assert len(saved) == len(result)